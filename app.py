@@ -1,30 +1,106 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response
+from werkzeug.middleware.proxy_fix import ProxyFix
 import os
-import uuid
-from werkzeug.utils import secure_filename
-import tempfile
 import shutil
+import json
+import time
+import importlib
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
 
 # Import our modular services
-from audio_processor import extract_audio_from_video, get_video_duration
-from transcription_service import transcribe_audio
-from translation_service import translate_text, LANGUAGES
+from audio_processor import extract_audio_from_video, MediaSource, PCM_SAMPLE_RATE, PCM_SAMPLE_WIDTH
+from transcription_service import transcribe_audio_segments, transcribe_segments, get_recognizer
+from translation_service import translate_segments, get_translation_memory, LANGUAGES, TRANSLATION_BACKEND
 from summarization_service import hybrid_summarize_advanced
+from summarization_engine import load_resources
+from transcript_segments import segments_text, locate_sentences, EXPORT_FORMATS
+from result_cache import ResultCache, SEGMENTS, SUMMARY, TRANSLATION
+from job_queue import JobQueue, QueueFullError, FAILED
+from upload_ingest import ingest_multipart, UploadRejected
+from scratch import ScratchSpace, ScratchFull, Reservation
+import metrics
+import outbound
+from metrics import timer, timed, record_timing, BYTES_PROCESSED
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 200 * 1024 * 1024  # 200MB
-app.config['ALLOWED_EXTENSIONS'] = {'mp4'}
+app.config['ALLOWED_EXTENSIONS'] = {'mp4', 'mp3', 'm4a', 'wav', 'ogg'}
+app.config['MAX_VIDEO_DURATION'] = int(os.environ.get('MAX_VIDEO_DURATION', 1800))  # 30 minutes
+# Write extracted audio to a WAV file instead of streaming PCM in memory
+app.config['KEEP_WAV'] = os.environ.get('KEEP_WAV', '').lower() in ('1', 'true', 'yes')
+app.config['RESULT_CACHE_MAX_BYTES'] = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+app.config['RESULT_CACHE_DIR'] = os.environ.get('RESULT_CACHE_DIR')  # Disk backend disabled when unset
+app.config['UPLOAD_BLOCK_SIZE'] = 1024 * 1024
+app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', 2))
+app.config['JOB_MAX_PENDING'] = int(os.environ.get('JOB_MAX_PENDING', 8))
+app.config['JOB_RETRY_AFTER'] = 30  # Seconds clients should wait after a 429
+# Audio-seconds of estimated work admitted at once; further jobs wait in the fair queue
+app.config['JOB_AUDIO_BUDGET'] = float(os.environ.get('JOB_AUDIO_BUDGET', 1800))
+app.config['SSE_KEEPALIVE'] = 15  # Seconds between keep-alive comments on idle streams
+# Add an X-Timing header with per-stage durations to every response
+app.config['TIMING_HEADER'] = os.environ.get('TIMING_HEADER', '').lower() in ('1', 'true', 'yes')
+# Load shared resources in create_app(), before gunicorn forks its workers
+app.config['WARM_UP'] = os.environ.get('WARM_UP', 'true').lower() not in ('0', 'false', 'no')
+# Also load the offline speech model (vosk/whisper) during warm-up
+app.config['PRELOAD_MODELS'] = os.environ.get('PRELOAD_MODELS', '').lower() in ('1', 'true', 'yes')
+# Languages translated at once, across all requests, when results fan out to several languages
+app.config['TRANSLATION_FANOUT_WORKERS'] = int(os.environ.get('TRANSLATION_FANOUT_WORKERS', 8))
+# Seconds a request waits for its translations before answering with the languages that finished
+app.config['TRANSLATION_TIMEOUT'] = int(os.environ.get('TRANSLATION_TIMEOUT', 300))
+# Reverse proxies in front of the app (one on Render); 0 when clients connect directly
+app.config['TRUSTED_PROXY_HOPS'] = int(os.environ.get('TRUSTED_PROXY_HOPS', 1))
 
-def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
+if app.config['TRUSTED_PROXY_HOPS']:
+    # Take the client address from the entry the trusted proxy appended
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXY_HOPS'])
+
+result_cache = ResultCache(
+    max_bytes=app.config['RESULT_CACHE_MAX_BYTES'],
+    cache_dir=app.config['RESULT_CACHE_DIR'],
+)
+
+# Uploads and intermediate files, on tmpfs when they fit its budget
+scratch = ScratchSpace(app.config['UPLOAD_FOLDER'])
+
+job_queue = JobQueue(
+    max_workers=app.config['JOB_WORKERS'],
+    max_pending=app.config['JOB_MAX_PENDING'],
+    cost_budget=app.config['JOB_AUDIO_BUDGET'],
+)
+
+# Relative cost of the stages, in audio-seconds of recognition
+TRANSLATION_COST = 0.2       # Per second of speech and target language
+SUMMARY_COST = 0.05          # Per second of speech
+CHARS_PER_SPEECH_SECOND = 15  # Typical transcript density
+
+# Languages keep translating here after a request stops waiting for them,
+# so their results still reach the result cache
+translation_pool = ThreadPoolExecutor(
+    max_workers=app.config['TRANSLATION_FANOUT_WORKERS'], thread_name_prefix='translate')
+
+metrics.REGISTRY.register(metrics.Gauge(
+    'video_summarizer_job_queue_depth', 'Jobs queued or running.', lambda: job_queue.depth))
+metrics.REGISTRY.register(metrics.Gauge(
+    'video_summarizer_job_queue_waiting', 'Jobs waiting in the fair queue for admission.',
+    lambda: job_queue.queued))
+metrics.REGISTRY.register(metrics.Gauge(
+    'video_summarizer_job_audio_seconds_in_flight', 'Estimated audio-seconds of work being processed.',
+    lambda: job_queue.cost_in_flight))
+metrics.REGISTRY.register(metrics.Gauge(
+    'video_summarizer_scratch_ram_bytes', 'Scratch space reserved on tmpfs.', lambda: scratch.reserved['ram']))
+metrics.REGISTRY.register(metrics.Gauge(
+    'video_summarizer_scratch_disk_bytes', 'Scratch space reserved on disk.', lambda: scratch.reserved['disk']))
 
 def cleanup_files(file_paths):
-    """Clean up temporary files"""
+    """Clean up temporary files and release scratch reservations"""
     for file_path in file_paths:
         try:
-            if os.path.exists(file_path):
+            if isinstance(file_path, Reservation):
+                file_path.release()
+            elif os.path.exists(file_path):
                 if os.path.isdir(file_path):
                     shutil.rmtree(file_path)
                 else:
@@ -32,6 +108,25 @@ def cleanup_files(file_paths):
         except Exception as e:
             print(f"Error cleaning up {file_path}: {e}")
 
+@app.before_request
+def begin_request_timing():
+    if app.config['TIMING_HEADER']:
+        metrics.start_request_timing()
+
+@app.after_request
+def record_request(response):
+    metrics.HTTP_REQUESTS.inc(endpoint=request.endpoint or 'unknown', status=response.status_code)
+    if app.config['TIMING_HEADER']:
+        timings = metrics.request_timings()
+        if timings:
+            response.headers['X-Timing'] = metrics.format_timing_header(timings)
+    return response
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Expose processing metrics in the Prometheus text format"""
+    return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/')
 def index():
     return render_template('index.html', languages=LANGUAGES)
@@ -43,149 +138,619 @@ def test_translation():
     test_translation_service()
     return jsonify({'message': 'Check console for test results'})
 
-@app.route('/transcribe', methods=['POST'])
-def transcribe_video():
-    temp_files = []
+def receive_upload():
+    """Stream the multipart upload to disk and validate its form fields.
+
+    The body is read in large blocks, hashed and written as it arrives, and
+    its audio is decoded by ffmpeg during the transfer. Uploads that are
+    too long are rejected as soon as the container header reveals it, and
+    invalid form fields as soon as they arrive (see ``validate_form_field``).
+
+    The upload goes into its own scratch reservation, sized from the
+    request's Content-Length, which is attached as ``upload.scratch`` and
+    released with ``cleanup_files``. The ``language`` field takes one
+    language code or several separated by commas.
+
+    Returns:
+        tuple: (upload, target_languages, error_message)
+
+    Raises:
+        ScratchFull: If there is no scratch space left for the upload.
+    """
+    if request.mimetype != 'multipart/form-data' or not request.mimetype_params.get('boundary'):
+        return None, None, 'No media file provided'
+
+    max_bytes = app.config['MAX_CONTENT_LENGTH']
+    reservation = scratch.reserve(min(request.content_length or max_bytes, max_bytes))
     try:
-        # Validate request
-        if 'video' not in request.files:
-            return jsonify({'success': False, 'error': 'No video file provided'})
-        
-        video_file = request.files['video']
-        if video_file.filename == '':
-            return jsonify({'success': False, 'error': 'No video file selected'})
-        
-        if not allowed_file(video_file.filename):
-            return jsonify({'success': False, 'error': 'Only MP4 files are allowed'})
-        
-        target_language = request.form.get('language', 'hi')
-        if target_language not in LANGUAGES:
-            return jsonify({'success': False, 'error': 'Invalid language selected'})
-        
-        # Save uploaded file
-        filename = secure_filename(video_file.filename)
-        video_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4()}_{filename}")
-        video_file.save(video_path)
-        temp_files.append(video_path)
-        
-        # Check video duration (max 5 minutes)
-        duration = get_video_duration(video_path)
-        if duration > 300:
-            cleanup_files(temp_files)
-            return jsonify({'success': False, 'error': 'Video must be 5 minutes or shorter'})
-        
-        # Extract audio
-        audio_path, temp_dir = extract_audio_from_video(video_path)
-        temp_files.append(audio_path)
-        temp_files.append(temp_dir)
-        
-        # Transcribe audio to English
-        english_text = transcribe_audio(audio_path)
+        with timer('save_upload'):
+            upload = ingest_multipart(
+                request.stream,
+                request.mimetype_params['boundary'],
+                reservation.directory,
+                allowed_extensions=app.config['ALLOWED_EXTENSIONS'],
+                max_duration=app.config['MAX_VIDEO_DURATION'],
+                max_bytes=max_bytes,
+                decode_audio=not app.config['KEEP_WAV'],
+                block_size=app.config['UPLOAD_BLOCK_SIZE'],
+                validate_field=validate_form_field,
+            )
+    except UploadRejected as e:
+        reservation.release()
+        return None, None, str(e)
+    except Exception:
+        reservation.release()
+        raise
+    upload.scratch = reservation
+    BYTES_PROCESSED.inc(upload.size, kind='upload')
+    return upload, parse_languages(upload.fields.get('language', 'hi')), None
+
+def validate_form_field(name, value):
+    """Return an error message for an invalid form field, or None"""
+    if name == 'language' and not parse_languages(value):
+        return 'Invalid language selected'
+    if name == 'action' and value not in PROCESSORS:
+        return 'Invalid action'
+    return None
+
+def parse_languages(value):
+    """Parse comma-separated language codes, dropping repeats
+
+    Returns:
+        list: Codes in the given order, or None if any is unsupported
+    """
+    codes = list(dict.fromkeys(code.strip() for code in value.split(',') if code.strip()))
+    if not codes or any(code not in LANGUAGES for code in codes):
+        return None
+    return codes
+
+def client_id():
+    """Identify the client a request is scheduled fairly against
+
+    Uses the client address as seen by the trusted proxy (see
+    TRUSTED_PROXY_HOPS). Headers the client chooses itself are ignored, so
+    it cannot claim extra fair-share slots by rotating them.
+    """
+    return request.remote_addr
+
+def cached_segments(upload):
+    """Return the cached transcript segments of the uploaded bytes, or None, looking them up once"""
+    if not hasattr(upload, 'cached_segments'):
+        cached = result_cache.get(SEGMENTS, upload.sha256) if upload.sha256 else None
+        upload.cached_segments = json.loads(cached) if cached else None
+    return upload.cached_segments
+
+def estimate_cost(action, upload, target_languages):
+    """Estimate the work of a request in audio-seconds of recognition.
+
+    Recognition costs the video duration, unless the transcript is cached,
+    in which case the transcript length gives the amount of speech.
+    Summarization and each translation add a share per second of speech.
+
+    Raises:
+        UploadRejected: If the upload cannot be probed as a media file.
+    """
+    segments = cached_segments(upload)
+    if segments is not None:
+        speech_seconds = len(segments_text(segments)) / CHARS_PER_SPEECH_SECOND
+        cost = 0.0
+    else:
+        duration = upload.duration
+        if duration is None:
+            try:
+                with timer('get_video_duration'):
+                    duration = upload.duration = MediaSource(upload.path).duration
+            except Exception as e:
+                print(f"❌ Could not probe upload {upload.filename}: {e}")
+                raise UploadRejected('Could not read the uploaded file; is it a supported audio or video file?')
+        # Longer videos are rejected as soon as they run
+        speech_seconds = cost = min(duration, app.config['MAX_VIDEO_DURATION'])
+
+    if action == 'summarize':
+        cost += speech_seconds * SUMMARY_COST
+        speech_seconds *= 0.2  # Only the summary is translated
+    languages = sum(1 for code in target_languages if code != 'en')
+    return max(1.0, cost + speech_seconds * TRANSLATION_COST * languages)
+
+def schedule(action, upload, target_languages, keep=True):
+    """Queue a processing chain with its estimated cost, releasing the upload if the queue is full"""
+    try:
+        return job_queue.submit(action, PROCESSORS[action], upload, target_languages,
+                                cost=estimate_cost(action, upload, target_languages),
+                                client=client_id(), keep=keep)
+    except Exception:
+        cleanup_files([upload.scratch])
+        raise
+
+def run_scheduled(action):
+    """Receive an upload, run it through the scheduler and answer with the result
+
+    Synchronous requests wait in the same fair queue as jobs, so they
+    count against the same audio-seconds budget.
+    """
+    upload, target_languages, error = receive_upload()
+    if error:
+        return jsonify({'success': False, 'error': error})
+
+    try:
+        job = schedule(action, upload, target_languages, keep=False)
+    except UploadRejected as e:
+        return jsonify({'success': False, 'error': str(e)})
+    job.wait()
+    record_timing('queue_wait', job.queue_seconds)
+    if job.status == FAILED:
+        return jsonify({'success': False, 'error': job.error})
+    return jsonify(job.result)
+
+def summarize_text(text):
+    """Summarize text, reusing any cached summary of the same transcript"""
+    return result_cache.get_or_compute(
+        SUMMARY, text, compute=lambda: timed('hybrid_summarize_advanced', hybrid_summarize_advanced, text))
+
+def translate_cached(segments, target_language, progress=None):
+    """Translate timed segments, reusing any cached translation to the same language
+
+    Returns:
+        list: Translated segments aligned with ``segments``, or None when
+        the translation service is unavailable.
+    """
+    if target_language == 'en':
+        return segments
+    on_chunk = chunk_reporter(progress, 'Translating', 'translation', language=target_language)
+
+    complete = []
+
+    def compute():
+        translated, all_translated = timed('translate_text', translate_segments, segments, target_language,
+                                           on_chunk=on_chunk, return_complete=True)
+        complete.append(all_translated)
+        return json.dumps([segment['text'] for segment in translated]) if translated is not None else ''
+
+    # Only complete translations are cached; a partial one keeps the English
+    # text of the sentences that failed and would outlive the backend outage
+    texts = result_cache.get_or_compute(
+        TRANSLATION, json.dumps([segment['text'] for segment in segments]), target_language,
+        compute=compute, should_cache=lambda value: all(complete))
+    if not texts:
+        return None
+    return [dict(segment, text=text) for segment, text in zip(segments, json.loads(texts))]
+
+def translate_languages(segments, target_languages, progress=None):
+    """Translate timed segments into several languages concurrently.
+
+    Upstream stages run once; only translation fans out, one task per
+    language on the shared pool, and all of them share the translation
+    engine's connection pool and rate limit. Each language is reported
+    with a ``translated`` event as soon as it finishes, so a slow language
+    never holds back the others. Languages still running after
+    ``TRANSLATION_TIMEOUT`` seconds are left out of the result.
+
+    Returns:
+        dict: Translated segments (or None when unavailable) by language
+        code, for the languages that finished in time.
+    """
+    # Each task runs in a copy of this context so its stage timings count towards this request
+    futures = {translation_pool.submit(contextvars.copy_context().run, translate_cached, segments, code, progress): code
+               for code in target_languages}
+    translations = {}
+    try:
+        for future in as_completed(futures, timeout=app.config['TRANSLATION_TIMEOUT']):
+            code = futures[future]
+            try:
+                translations[code] = future.result()
+            except Exception as e:
+                print(f"❌ Translation to {LANGUAGES[code]} failed: {e}")
+                translations[code] = None
+            translated = translations[code]
+            report(progress, f'Translated to {LANGUAGES[code]}', event='translated', language=code,
+                   success=translated is not None, text=segments_text(translated) if translated else '')
+    except FuturesTimeout:
+        pending = [LANGUAGES[code] for code in target_languages if code not in translations]
+        print(f"⏱️ Still translating to {', '.join(pending)}; answering without them")
+    return translations
+
+def language_results(translations, target_languages, english_text):
+    """Per-language result entries for the response, keyed by language code"""
+    results = {}
+    for code in target_languages:
+        segments = translations.get(code)
+        entry = {
+            'language': LANGUAGES[code],
+            'success': segments is not None,
+            'text': translated_text(segments, english_text),
+            'segments': segments or [],
+        }
+        if code not in translations:
+            # The translation keeps running and lands in the result cache
+            entry['error'] = 'Translation is taking too long, please try again shortly'
+        results[code] = entry
+    return results
+
+def translated_text(segments, english_text):
+    """Flatten translated segments, marking the original text when translation failed"""
+    if segments is None:
+        return f"[Translation unavailable] {english_text}"
+    return segments_text(segments)
+
+def report(progress, stage, event='stage', **data):
+    """Forward a stage description and any partial result to an optional progress callback"""
+    if progress:
+        progress(stage, event=event, **data)
+
+def chunk_reporter(progress, stage, event, **extra):
+    """Adapt a service ``on_chunk(index, total, text)`` callback to progress events"""
+    if not progress:
+        return None
+    return lambda index, total, text: report(progress, stage, event=event, index=index, total=total,
+                                             text=text, **extra)
+
+def transcribe_upload(upload, temp_files, progress=None):
+    """Transcribe a received upload, decoding its audio at most once.
+
+    Audio decoded while the upload streamed in is used directly. Otherwise
+    the container is probed once for its duration and the audio track is
+    streamed straight to 16 kHz mono PCM for the recognizer. The WAV file
+    round-trip is only taken when ``KEEP_WAV`` is enabled.
+
+    Timed transcript segments are cached by the hash of the uploaded
+    bytes, so a repeat upload skips extraction and recognition entirely.
+
+    Returns:
+        tuple: (segments, error_message)
+    """
+    segments = cached_segments(upload)
+    if segments:
+        report(progress, 'Transcribing audio', event='transcript', index=0, total=1,
+               text=segments_text(segments))
+        return segments, None
+
+    report(progress, 'Checking media duration')
+    source = MediaSource(upload.path)
+
+    # Check video duration
+    max_duration = app.config['MAX_VIDEO_DURATION']
+    duration = upload.duration
+    if duration is None:
+        with timer('get_video_duration'):
+            duration = source.duration
+    if duration > max_duration:
+        return None, f'Media must be {max_duration // 60} minutes or shorter'
+    report(progress, 'Duration probed', duration=duration)
+
+    report(progress, 'Extracting audio')
+    on_chunk = chunk_reporter(progress, 'Transcribing audio', 'transcript')
+    if app.config['KEEP_WAV']:
+        wav_scratch = scratch.reserve(int(duration * PCM_SAMPLE_RATE * PCM_SAMPLE_WIDTH) + 1024)
+        temp_files.append(wav_scratch)
+        audio_path, _ = timed('extract_audio_from_video', extract_audio_from_video, upload.path,
+                              wav_scratch.path('audio.wav'))
+        BYTES_PROCESSED.inc(os.path.getsize(audio_path), kind='audio')
+        report(progress, 'Audio extracted')
+        segments = timed('transcribe_audio', transcribe_audio_segments, audio_path, on_chunk=on_chunk)
+    else:
+        # Audio decoded during the upload is handed over once and released
+        pcm_data, upload.pcm = upload.pcm, None
+        if pcm_data is None:
+            try:
+                pcm_data = timed('extract_audio_from_video', source.read_pcm)
+            except Exception as e:
+                raise Exception(f"Audio extraction failed: {str(e)}")
+        BYTES_PROCESSED.inc(len(pcm_data), kind='audio')
+        report(progress, 'Audio extracted')
+        segments = timed('transcribe_audio', transcribe_segments, pcm_data, on_chunk=on_chunk)
+
+    if not segments_text(segments).strip():
+        return None, 'No speech detected in the file'
+
+    if upload.sha256:
+        result_cache.set(SEGMENTS, upload.sha256, value=json.dumps(segments))
+    return segments, None
+
+def process_transcription(upload, target_languages, progress=None):
+    """Run the transcription chain on a received upload and remove it afterwards.
+
+    Returns:
+        dict: JSON-ready result with a ``success`` flag
+    """
+    temp_files = [upload.scratch]
+    try:
+        report(progress, 'Upload saved', size=upload.size)
         
-        if not english_text or len(english_text.strip()) == 0:
-            cleanup_files(temp_files)
-            return jsonify({'success': False, 'error': 'No speech detected in the video'})
+        # Extract audio and transcribe to English
+        segments, error = transcribe_upload(upload, temp_files, progress)
+        if error:
+            return {'success': False, 'error': error}
+        english_text = segments_text(segments)
         
         print(f"📊 Original transcription: {len(english_text)} characters")
         
-        # Translate to target language
-        if target_language != 'en':
-            translated_text = translate_text(english_text, target_language)
-        else:
-            translated_text = english_text
+        # Translate to every target language at once, segment by segment
+        report(progress, 'Translating')
+        translations = language_results(
+            translate_languages(segments, target_languages, progress), target_languages, english_text)
+        primary = translations[target_languages[0]]
+        target_text = primary['text']
         
-        # Clean up files
-        cleanup_files(temp_files)
-        
-        return jsonify({
+        return {
             'success': True,
             'transcription_english': english_text,
-            'transcription_target': translated_text,
-            'language': LANGUAGES[target_language],
+            'transcription_target': target_text,
+            'segments_english': segments,
+            'segments_target': primary['segments'],
+            'language': primary['language'],
+            'target_languages': target_languages,
+            'translations': translations,
             'original_length': len(english_text),
-            'translated_length': len(translated_text) if translated_text else 0
-        })
-        
-    except Exception as e:
+            'translated_length': len(target_text) if target_text else 0
+        }
+    finally:
         cleanup_files(temp_files)
-        print(f"❌ Transcription route error: {e}")
-        return jsonify({'success': False, 'error': str(e)})
 
-@app.route('/summarize', methods=['POST'])
-def summarize_video():
-    temp_files = []
+def process_summary(upload, target_languages, progress=None):
+    """Run the summarization chain on a received upload and remove it afterwards.
+
+    Returns:
+        dict: JSON-ready result with a ``success`` flag
+    """
+    temp_files = [upload.scratch]
     try:
-        # Validate request
-        if 'video' not in request.files:
-            return jsonify({'success': False, 'error': 'No video file provided'})
+        report(progress, 'Upload saved', size=upload.size)
         
-        video_file = request.files['video']
-        if video_file.filename == '':
-            return jsonify({'success': False, 'error': 'No video file selected'})
+        # Extract audio and transcribe to English
+        segments, error = transcribe_upload(upload, temp_files, progress)
+        if error:
+            return {'success': False, 'error': error}
+        english_text = segments_text(segments)
         
-        if not allowed_file(video_file.filename):
-            return jsonify({'success': False, 'error': 'Only MP4 files are allowed'})
+        # Create summary in English and find where each sentence was said
+        report(progress, 'Summarizing')
+        english_summary = summarize_text(english_text)
+        summary_segments = locate_sentences(english_summary, segments)
+        report(progress, 'Summary ready', event='summary', text=english_summary)
         
-        target_language = request.form.get('language', 'hi')
-        if target_language not in LANGUAGES:
-            return jsonify({'success': False, 'error': 'Invalid language selected'})
+        # Translate summary to every target language at once, sentence by sentence
+        report(progress, 'Translating')
+        translations = language_results(
+            translate_languages(summary_segments, target_languages, progress), target_languages, english_summary)
+        primary = translations[target_languages[0]]
         
-        # Save uploaded file
-        filename = secure_filename(video_file.filename)
-        video_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4()}_{filename}")
-        video_file.save(video_path)
-        temp_files.append(video_path)
-        
-        # Check video duration
-        duration = get_video_duration(video_path)
-        if duration > 300:
-            cleanup_files(temp_files)
-            return jsonify({'success': False, 'error': 'Video must be 5 minutes or shorter'})
-        
-        # Extract audio
-        audio_path, temp_dir = extract_audio_from_video(video_path)
-        temp_files.append(audio_path)
-        temp_files.append(temp_dir)
-        
-        # Transcribe audio to English
-        english_text = transcribe_audio(audio_path)
-        
-        if not english_text or len(english_text.strip()) == 0:
-            cleanup_files(temp_files)
-            return jsonify({'success': False, 'error': 'No speech detected in the video'})
-        
-        # Create summary in English
-        english_summary = hybrid_summarize_advanced(english_text)
-        
-        # Translate summary to target language
-        if target_language != 'en':
-            translated_summary = translate_text(english_summary, target_language)
-        else:
-            translated_summary = english_summary
-        
-        # Clean up files
-        cleanup_files(temp_files)
-        
-        return jsonify({
+        return {
             'success': True,
             'summary_english': english_summary,
-            'summary_target': translated_summary,
-            'language': LANGUAGES[target_language],
+            'summary_target': primary['text'],
+            'summary_segments': summary_segments,
+            'summary_segments_target': primary['segments'],
+            'language': primary['language'],
+            'target_languages': target_languages,
+            'translations': translations,
             'original_text_length': len(english_text),
             'summary_length': len(english_summary)
-        })
+        }
+    finally:
+        cleanup_files(temp_files)
+
+PROCESSORS = {
+    'transcribe': process_transcription,
+    'summarize': process_summary,
+}
+
+@app.route('/cache/stats')
+def cache_stats():
+    """Report result cache hit/miss counters and memory usage"""
+    return jsonify(result_cache.stats())
+
+@app.route('/scratch/stats')
+def scratch_stats():
+    """Report scratch space reserved on tmpfs and disk, and space reclaimed by the janitor"""
+    return jsonify(scratch.stats())
+
+@app.route('/translation-memory/stats')
+def translation_memory_stats():
+    """Report translation memory hit ratio and characters saved"""
+    return jsonify(get_translation_memory().stats())
+
+@app.route('/outbound/stats')
+def outbound_stats():
+    """Report circuit state, latency percentiles and hedging per external service"""
+    return jsonify({name: service.stats() for name, service in outbound.services().items()})
+
+@app.route('/transcribe', methods=['POST'])
+def transcribe_video():
+    try:
+        return run_scheduled('transcribe')
         
+    except (QueueFullError, ScratchFull) as e:
+        return queue_full_response(str(e))
+    except Exception as e:
+        print(f"❌ Transcription route error: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/summarize', methods=['POST'])
+def summarize_video():
+    try:
+        return run_scheduled('summarize')
+        
+    except (QueueFullError, ScratchFull) as e:
+        return queue_full_response(str(e))
     except Exception as e:
-        cleanup_files(temp_files)
         print(f"❌ Summarize route error: {e}")
         return jsonify({'success': False, 'error': str(e)})
 
+def queue_full_response(message):
+    response = jsonify({'success': False, 'error': message})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(app.config['JOB_RETRY_AFTER'])
+    return response
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue a transcribe/summarize job and return its id immediately"""
+    try:
+        # Reject before receiving the upload when the queue is already full
+        if job_queue.depth >= job_queue.max_pending:
+            return queue_full_response('Server is busy, please try again shortly')
+        
+        upload, target_languages, error = receive_upload()
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
+        
+        action = upload.fields.get('action', 'transcribe')
+        try:
+            job = schedule(action, upload, target_languages)
+        except QueueFullError as e:
+            return queue_full_response(str(e))
+        except UploadRejected as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        return jsonify({'success': True, 'job_id': job.id, 'status': job.status}), 202
+    
+    except ScratchFull as e:
+        return queue_full_response(str(e))
+        
+    except Exception as e:
+        print(f"❌ Job submission error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Report the status of a queued job, including its result once finished"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, **job.to_dict()})
+
+# Segment lists in a finished job's result that can be exported
+EXPORT_TRACKS = {
+    'english': 'segments_english',
+    'target': 'segments_target',
+    'summary': 'summary_segments',
+    'summary_target': 'summary_segments_target',
+}
+
+@app.route('/jobs/<job_id>/export.<fmt>')
+def export_job(job_id, fmt):
+    """Download a finished job's timed segments as SRT, VTT or JSON
+
+    ``?track=`` selects the English transcript (default), its translation,
+    or the English or translated summary. For jobs translated into several
+    languages, ``?language=`` picks the translation (the first by default).
+    """
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'success': False, 'error': 'Unsupported export format'}), 400
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    if not job.finished or not job.result or not job.result.get('success'):
+        return jsonify({'success': False, 'error': 'Job has no results to export'}), 409
+
+    track = request.args.get('track', 'summary' if job.kind == 'summarize' else 'english')
+    segments = job.result.get(EXPORT_TRACKS.get(track, ''))
+    language = request.args.get('language')
+    if language and track in ('target', 'summary_target'):
+        segments = job.result.get('translations', {}).get(language, {}).get('segments')
+        track = f'{track}-{language}'
+    if not segments:
+        return jsonify({'success': False, 'error': f'No {track} segments in this job'}), 404
+
+    render, mimetype, extension = EXPORT_FORMATS[fmt]
+    return Response(render(segments), mimetype=f'{mimetype}; charset=utf-8', headers={
+        'Content-Disposition': f'attachment; filename="{job_id}-{track}.{extension}"'})
+
+def format_sse(event, data, event_id=None):
+    """Format one Server-Sent Events message"""
+    message = f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    if event_id is not None:
+        message = f"id: {event_id}\n" + message
+    return message
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Stream a job's stage events and partial results as Server-Sent Events
+
+    The stream ends with a ``done`` or ``failed`` event carrying the same
+    payload as ``/jobs/<job_id>``. Reconnecting clients resume after the
+    ``Last-Event-ID`` they received.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+
+    try:
+        last_id = int(request.headers.get('Last-Event-ID', -1))
+    except ValueError:
+        last_id = -1
+
+    def generate():
+        after = last_id
+        while True:
+            events = job.wait_for_events(after, app.config['SSE_KEEPALIVE'])
+            for index, event in events:
+                yield format_sse(event['event'], event, index)
+                after = index
+            if job.finished and not events:
+                yield format_sse(job.status, {'success': True, **job.to_dict()})
+                return
+            if not events:
+                yield ': keep-alive\n\n'
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# Modules imported lazily by the services, loaded up front during warm-up
+WARM_MODULES = ['scipy.sparse.linalg']
+if TRANSLATION_BACKEND == 'googletrans':
+    WARM_MODULES.append('googletrans')
+
+WARM_UP_TEXT = (
+    "The lecture starts with an overview of the course. Each week covers one topic in depth. "
+    "Assignments are due on Fridays and are graded within a week. The final project counts "
+    "for half of the grade. Office hours are held every Tuesday afternoon. Questions about "
+    "the material can also be posted on the course forum at any time."
+)
+
+def warm_up():
+    """Load heavy modules, language resources and optionally speech models
+
+    Called before gunicorn forks (``preload_app``), so the loaded pages are
+    shared copy-on-write by every worker instead of being paid for by the
+    first request in each one.
+    """
+    start = time.perf_counter()
+    with timer('warm_up'):
+        for module in WARM_MODULES:
+            importlib.import_module(module)
+        load_resources()
+        # One small summary primes the stemmer cache and the summarization path
+        hybrid_summarize_advanced(WARM_UP_TEXT)
+        if app.config['PRELOAD_MODELS']:
+            recognizer = get_recognizer()
+            if hasattr(recognizer, 'load'):
+                try:
+                    recognizer.load()
+                except Exception as e:
+                    print(f"⚠️ Could not preload speech model: {e}")
+    print(f"🔥 Warm-up finished in {time.perf_counter() - start:.2f}s")
+
+def create_app():
+    """Prepare the application for serving and return it
+
+    Creates the upload folder, starts the scratch janitor (which first
+    reclaims files orphaned by killed workers) and runs the warm-up when
+    ``WARM_UP`` is on.
+    Use it as the gunicorn entry point (``app:create_app()``) together with
+    ``preload_app`` so this happens once in the master process.
+    """
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    scratch.disk_dir = app.config['UPLOAD_FOLDER']  # Follow any change made after import
+    scratch.start_janitor()
+    if app.config['WARM_UP']:
+        warm_up()
+    return app
+
 if __name__ == '__main__':
     # Create necessary directories
-    if not os.path.exists('uploads'):
-        os.makedirs('uploads')
     if not os.path.exists('temp'):
         os.makedirs('temp')
     
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
+    create_app().run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
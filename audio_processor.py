@@ -1,7 +1,14 @@
 import os
 import sys
 import tempfile
-from moviepy.editor import VideoFileClip
+import subprocess
+import wave
+import json
+import mmap
+import shutil
+import struct
+from collections import namedtuple
+import numpy as np
 
 # Add this compatibility fix at the top
 import os
@@ -10,54 +17,339 @@ import sys
 # Workaround for moviepy audio issues on Render
 os.environ["IMAGEIO_FFMPEG_EXE"] = "/usr/bin/ffmpeg"
 
-try:
-    from moviepy.editor import VideoFileClip
-except ImportError as e:
-    print(f"MoviePy import error: {e}")
-    
-try:
-    from pydub import AudioSegment
-except ImportError as e:
-    print(f"Pydub import error: {e}")
-    
 # -------------------------------------------------------------------
 # Compatibility patch for Python 3.13 (audioop removed from stdlib)
 # -------------------------------------------------------------------
 
 
-from pydub import AudioSegment
+from moviepy.config import get_setting
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+# Recognizer-ready PCM format (16 kHz, mono, signed 16-bit little endian)
+PCM_SAMPLE_RATE = 16000
+PCM_SAMPLE_WIDTH = 2
+PCM_CHANNELS = 1
+PCM_BLOCK_SIZE = 1024 * 1024
+
+MP4_EXTENSIONS = {'.mp4', '.m4a', '.m4v', '.mov'}
+AUDIO_EXTENSIONS = {'.mp3', '.m4a', '.wav', '.ogg'}  # Audio-only uploads, decoded without a video stream
+
+# Voice-activity detection over the decoded PCM
+VAD_FRAME_MS = 30                # Analysis frame length
+VAD_MARGIN_DB = 12               # Speech must be this far above the noise floor
+VAD_MIN_DBFS = -55               # Frames quieter than this are never speech
+VAD_MIN_SPEECH_MS = 250          # Shorter bursts (clicks, coughs) are dropped
+VAD_MIN_SILENCE_MS = int(os.environ.get('VAD_MIN_SILENCE_MS', 1000))  # Shorter pauses stay in a region
+VAD_PADDING_MS = 200             # Kept around each region so word edges are not clipped
+
+
+class MediaInfo(namedtuple('MediaInfo', ['duration', 'audio_codec', 'sample_rate', 'channels'])):
+    """Container metadata: duration in seconds and the first audio stream, if any"""
+
+    @property
+    def has_audio(self):
+        return self.audio_codec is not None
+
+
+def _iter_boxes(data, start, end):
+    """Yield (type, payload_start, box_end) for the ISO BMFF boxes in a range"""
+    offset = start
+    while offset + 8 <= end:
+        size, box_type = struct.unpack_from('>I4s', data, offset)
+        header = 8
+        if size == 1:
+            if offset + 16 > end:
+                return
+            size = struct.unpack_from('>Q', data, offset + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            return
+        yield box_type, offset + header, offset + size
+        offset += size
+
+
+def _find_box(data, start, end, box_type):
+    for found_type, payload, box_end in _iter_boxes(data, start, end):
+        if found_type == box_type:
+            return payload, box_end
+    return None
+
 
+def _parse_mp4_audio_track(data, start, end):
+    """Return (codec, sample_rate, channels) if a trak is an audio track"""
+    mdia = _find_box(data, start, end, b'mdia')
+    if mdia is None:
+        return None
+    hdlr = _find_box(data, mdia[0], mdia[1], b'hdlr')
+    if hdlr is None or data[hdlr[0] + 8:hdlr[0] + 12] != b'soun':
+        return None
 
-def extract_audio_from_video(video_path):
+    timescale = None
+    mdhd = _find_box(data, mdia[0], mdia[1], b'mdhd')
+    if mdhd is not None:
+        version = data[mdhd[0]]
+        timescale = struct.unpack_from('>I', data, mdhd[0] + (20 if version == 1 else 12))[0]
+
+    stsd = None
+    minf = _find_box(data, mdia[0], mdia[1], b'minf')
+    if minf is not None:
+        stbl = _find_box(data, minf[0], minf[1], b'stbl')
+        if stbl is not None:
+            stsd = _find_box(data, stbl[0], stbl[1], b'stsd')
+    if stsd is None or stsd[0] + 8 + 36 > stsd[1]:
+        return 'unknown', timescale, None
+
+    # First AudioSampleEntry: size, format, reserved, data ref, then the audio fields
+    entry = stsd[0] + 8
+    codec = data[entry + 4:entry + 8].decode('latin-1').strip()
+    channels = struct.unpack_from('>H', data, entry + 24)[0]
+    sample_rate = struct.unpack_from('>I', data, entry + 32)[0] >> 16
+    return codec, sample_rate or timescale, channels or None
+
+
+def probe_mp4(path):
     """
-    Extracts the audio track from a video file and saves it as a WAV file.
-    
-    Args:
-        video_path (str): Path to the video file.
-    
+    Read duration and audio stream details straight from the MP4 header.
+
+    The file is memory-mapped and only the ``moov`` box is parsed, so just
+    the header pages are read from disk, wherever the box sits in the file.
+
     Returns:
-        tuple: (path_to_extracted_audio, temp_directory_path)
+        MediaInfo: The parsed metadata, or None if the header is unusable.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < 8:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            moov = _find_box(data, 0, size, b'moov')
+            if moov is None:
+                return None
+            mvhd = _find_box(data, moov[0], moov[1], b'mvhd')
+            if mvhd is None:
+                return None
+            if data[mvhd[0]] == 1:
+                timescale, duration = struct.unpack_from('>IQ', data, mvhd[0] + 20)
+            else:
+                timescale, duration = struct.unpack_from('>II', data, mvhd[0] + 12)
+            if not timescale or not duration:
+                return None  # Fragmented files keep their duration elsewhere
+
+            audio = None
+            for box_type, payload, box_end in _iter_boxes(data, moov[0], moov[1]):
+                if box_type == b'trak':
+                    audio = _parse_mp4_audio_track(data, payload, box_end)
+                    if audio is not None:
+                        break
+            codec, sample_rate, channels = audio or (None, None, None)
+            return MediaInfo(duration / float(timescale), codec, sample_rate, channels)
+
+
+def probe_wav(path):
+    """
+    Read duration and format from a WAV header without decoding anything.
+
+    Returns:
+        MediaInfo: The parsed metadata, or None for WAV variants the
+        ``wave`` module cannot read (such as float or extensible PCM).
     """
     try:
-        # Create a temporary directory for extracted audio
-        temp_dir = tempfile.mkdtemp()
-        temp_audio_path = os.path.join(temp_dir, "audio.wav")
+        with wave.open(path, 'rb') as wav_file:
+            sample_rate = wav_file.getframerate()
+            return MediaInfo(wav_file.getnframes() / float(sample_rate),
+                             f"pcm_s{wav_file.getsampwidth() * 8}le", sample_rate, wav_file.getnchannels())
+    except (wave.Error, EOFError, ZeroDivisionError):
+        return None
+
+
+def _ffprobe_binary():
+    ffmpeg = get_setting("FFMPEG_BINARY")
+    candidate = os.path.join(os.path.dirname(ffmpeg), 'ffprobe')
+    if os.path.dirname(ffmpeg) and os.path.exists(candidate):
+        return candidate
+    return shutil.which('ffprobe')
+
+
+def probe_ffprobe(path):
+    """Probe any container with a single ffprobe (or ffmpeg) call"""
+    ffprobe = _ffprobe_binary()
+    if ffprobe is None:
+        infos = ffmpeg_parse_infos(path)
+        audio_codec = 'unknown' if infos.get('audio_found') else None
+        return MediaInfo(infos.get('duration') or 0, audio_codec, infos.get('audio_fps'), None)
+
+    output = subprocess.run(
+        [ffprobe, '-v', 'error', '-show_entries',
+         'format=duration:stream=codec_type,codec_name,sample_rate,channels',
+         '-of', 'json', path],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True).stdout
+    info = json.loads(output.decode('utf8'))
+    duration = float(info.get('format', {}).get('duration') or 0)
+    for stream in info.get('streams', []):
+        if stream.get('codec_type') == 'audio':
+            return MediaInfo(duration, stream.get('codec_name'),
+                             int(stream.get('sample_rate') or 0) or None, stream.get('channels'))
+    return MediaInfo(duration, None, None, None)
+
+
+def probe_media(path):
+    """
+    Get duration and audio stream details for a media file.
+
+    MP4-family and WAV files are read header-only; anything else, or a
+    file whose header cannot be parsed, costs one ffprobe call.
+
+    Returns:
+        MediaInfo: duration, audio_codec, sample_rate and channels.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.wav':
+        info = probe_wav(path)
+        if info is not None:
+            return info
+    if extension in MP4_EXTENSIONS:
+        try:
+            info = probe_mp4(path)
+            if info is not None:
+                return info
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Warning: MP4 header probe failed, using ffprobe: {e}")
+    return probe_ffprobe(path)
+
+
+class MediaSource:
+    """
+    A media file that is probed once and decoded straight to PCM.
+
+    The container metadata (duration, audio stream) comes from a single
+    header probe that is cached on the instance, and the audio track is
+    streamed from one ffmpeg process as 16 kHz mono PCM, so callers never
+    have to open the file with moviepy or round-trip through a WAV file.
+    Audio-only files work the same way, and a WAV file that is already
+    16 kHz mono PCM is read directly without starting ffmpeg.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._info = None
+
+    def probe(self):
+        """Return the container MediaInfo, probing the file only once."""
+        if self._info is None:
+            self._info = probe_media(self.path)
+        return self._info
+
+    @property
+    def duration(self):
+        return self.probe().duration or 0
 
-        # Extract audio using moviepy
-        video_clip = VideoFileClip(video_path)
-        audio_clip = video_clip.audio
+    @property
+    def has_audio(self):
+        return self.probe().has_audio
 
-        if audio_clip is None:
-            raise Exception("No audio stream found in the video.")
+    @property
+    def is_pcm(self):
+        """Whether the file is a WAV already in the recognizer's PCM format"""
+        info = self.probe()
+        return (os.path.splitext(self.path)[1].lower() == '.wav'
+                and info.audio_codec == f"pcm_s{PCM_SAMPLE_WIDTH * 8}le"
+                and info.sample_rate == PCM_SAMPLE_RATE and info.channels == PCM_CHANNELS)
 
-        # Write the audio to a WAV file (quietly)
-        audio_clip.write_audiofile(temp_audio_path, verbose=False, logger=None)
+    def _iter_wav_pcm(self, block_size):
+        frame_size = PCM_SAMPLE_WIDTH * PCM_CHANNELS
+        with wave.open(self.path, 'rb') as wav_file:
+            while True:
+                block = wav_file.readframes(max(1, block_size // frame_size))
+                if not block:
+                    break
+                yield block
 
-        # Release resources
-        audio_clip.close()
-        video_clip.close()
+    def iter_pcm(self, block_size=PCM_BLOCK_SIZE):
+        """
+        Stream the audio track as 16 kHz mono 16-bit PCM.
 
-        return temp_audio_path, temp_dir
+        Args:
+            block_size (int): Number of bytes yielded per block.
+
+        Yields:
+            bytes: Raw PCM blocks, in order.
+        """
+        if not self.has_audio:
+            raise Exception("No audio stream found in the file.")
+        if self.is_pcm:
+            yield from self._iter_wav_pcm(block_size)
+            return
+
+        cmd = [
+            get_setting("FFMPEG_BINARY"), "-v", "error", "-nostdin",
+            "-i", self.path, "-vn",
+            "-ac", str(PCM_CHANNELS), "-ar", str(PCM_SAMPLE_RATE),
+            "-f", "s16le", "-acodec", "pcm_s16le", "-",
+        ]
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                bufsize=block_size)
+        try:
+            while True:
+                block = proc.stdout.read(block_size)
+                if not block:
+                    break
+                yield block
+            stderr = proc.stderr.read()
+            if proc.wait() != 0:
+                raise Exception(stderr.decode('utf8', 'replace').strip() or "ffmpeg failed")
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+            proc.stderr.close()
+
+    def read_pcm(self):
+        """Decode the whole audio track to PCM bytes."""
+        return b''.join(self.iter_pcm())
+
+    def write_wav(self, wav_path=None):
+        """
+        Stream the audio track into a 16 kHz mono WAV file.
+
+        Args:
+            wav_path (str): Destination path. A fresh temporary directory
+                is created when omitted.
+
+        Returns:
+            tuple: (path_to_wav_file, temp_directory_path or None)
+        """
+        temp_dir = None
+        if wav_path is None:
+            temp_dir = tempfile.mkdtemp()
+            wav_path = os.path.join(temp_dir, "audio.wav")
+
+        with wave.open(wav_path, 'wb') as wav_file:
+            wav_file.setnchannels(PCM_CHANNELS)
+            wav_file.setsampwidth(PCM_SAMPLE_WIDTH)
+            wav_file.setframerate(PCM_SAMPLE_RATE)
+            for block in self.iter_pcm():
+                wav_file.writeframes(block)
+
+        return wav_path, temp_dir
+
+
+def extract_audio_from_video(video_path, wav_path=None):
+    """
+    Extracts the audio track from a video file and saves it as a WAV file.
+    
+    Args:
+        video_path (str): Path to the video file.
+        wav_path (str): Destination path. A fresh temporary directory is
+            created when omitted.
+    
+    Returns:
+        tuple: (path_to_extracted_audio, temp_directory_path or None)
+    """
+    try:
+        return MediaSource(video_path).write_wav(wav_path)
 
     except Exception as e:
         raise Exception(f"Audio extraction failed: {str(e)}")
@@ -65,34 +357,26 @@ def extract_audio_from_video(video_path):
 
 def convert_to_wav(audio_path):
     """
-    Converts an audio file to WAV format using pydub.
-    
+    Converts an audio file to a 16 kHz mono WAV file.
+
+    The audio is decoded by ffmpeg and written in PCM_BLOCK_SIZE blocks,
+    so memory use stays constant however long the file is. A WAV file
+    already in that format is returned unchanged.
+
     Args:
         audio_path (str): Path to the audio file.
-    
+
     Returns:
         str: Path to the converted WAV file.
     """
     try:
-        ext = os.path.splitext(audio_path)[1].lower()
-
-        # If it's already a WAV file, just return it
-        if ext == '.wav':
+        source = MediaSource(audio_path)
+        if source.is_pcm:
             return audio_path
 
-        # Load based on file extension
-        if ext == '.mp3':
-            audio = AudioSegment.from_mp3(audio_path)
-        elif ext == '.m4a':
-            audio = AudioSegment.from_file(audio_path, format="m4a")
-        else:
-            audio = AudioSegment.from_file(audio_path)
-
-        # Export to WAV
-        wav_path = audio_path.replace(ext, '.wav')
-        audio.export(wav_path, format='wav')
-
-        return wav_path
+        base, ext = os.path.splitext(audio_path)
+        wav_path = base + ('.16k.wav' if ext.lower() == '.wav' else '.wav')
+        return source.write_wav(wav_path)[0]
 
     except Exception as e:
         raise Exception(f"Audio conversion failed: {str(e)}")
@@ -109,10 +393,86 @@ def get_video_duration(video_path):
         float: Duration of the video in seconds (0 if not available).
     """
     try:
-        video_clip = VideoFileClip(video_path)
-        duration = video_clip.duration or 0
-        video_clip.close()
-        return duration
+        return MediaSource(video_path).duration
     except Exception as e:
         print(f"Warning: Could not get video duration: {e}")
         return 0
+
+
+class SpeechRegion(namedtuple('SpeechRegion', ['start_byte', 'end_byte', 'start', 'end'])):
+    """A span of speech in a PCM buffer, as byte offsets and seconds"""
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+
+def frame_energies(pcm_data, sample_rate=PCM_SAMPLE_RATE, frame_ms=VAD_FRAME_MS):
+    """
+    Compute the RMS level of each frame of 16-bit mono PCM in dBFS.
+
+    Returns:
+        numpy.ndarray: One level per complete frame.
+    """
+    frame_len = int(sample_rate * frame_ms / 1000)
+    samples = np.frombuffer(pcm_data, dtype='<i2', count=len(pcm_data) // PCM_SAMPLE_WIDTH)
+    frame_count = len(samples) // frame_len
+    if frame_count == 0:
+        return np.zeros(0)
+    frames = samples[:frame_count * frame_len].reshape(frame_count, frame_len).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1)) / 32768.0
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def _runs(mask):
+    """Return (start, end) index pairs of the True runs in a boolean array"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return list(zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)))
+
+
+def detect_speech(pcm_data, sample_rate=PCM_SAMPLE_RATE, frame_ms=VAD_FRAME_MS,
+                  min_silence_ms=VAD_MIN_SILENCE_MS):
+    """
+    Find the regions of 16-bit mono PCM that contain speech.
+
+    Frames count as speech when they are VAD_MARGIN_DB above the noise
+    floor (a low percentile of all frame levels). Pauses shorter than
+    ``min_silence_ms`` are bridged, bursts shorter than VAD_MIN_SPEECH_MS
+    are dropped and every region is padded by VAD_PADDING_MS.
+
+    Args:
+        pcm_data (bytes): Raw PCM, as produced by MediaSource.
+        sample_rate (int): Sample rate of ``pcm_data``.
+
+    Returns:
+        list: SpeechRegion tuples in order; empty if there is no speech.
+    """
+    levels = frame_energies(pcm_data, sample_rate, frame_ms)
+    if len(levels) == 0:
+        return []
+
+    noise_floor, loud = np.percentile(levels, [10, 90])
+    # Keep the threshold below the loud frames when the track has no pauses
+    threshold = max(VAD_MIN_DBFS, min(noise_floor + VAD_MARGIN_DB, loud - VAD_MARGIN_DB))
+    speech = levels > threshold
+
+    # Bridge short pauses, then drop short bursts
+    for start, end in _runs(~speech):
+        if start > 0 and end < len(speech) and (end - start) * frame_ms < min_silence_ms:
+            speech[start:end] = True
+    for start, end in _runs(speech):
+        if (end - start) * frame_ms < VAD_MIN_SPEECH_MS:
+            speech[start:end] = False
+
+    bytes_per_frame = int(sample_rate * frame_ms / 1000) * PCM_SAMPLE_WIDTH
+    padding = int(VAD_PADDING_MS / frame_ms) * bytes_per_frame
+    regions = []
+    for start, end in _runs(speech):
+        start_byte = max(0, int(start) * bytes_per_frame - padding)
+        end_byte = min(len(pcm_data), int(end) * bytes_per_frame + padding)
+        if regions and start_byte <= regions[-1].end_byte:
+            start_byte = regions.pop().start_byte
+        regions.append(SpeechRegion(start_byte, end_byte,
+                                    start_byte / float(sample_rate * PCM_SAMPLE_WIDTH),
+                                    end_byte / float(sample_rate * PCM_SAMPLE_WIDTH)))
+    return regions
@@ -0,0 +1,237 @@
+"""
+Process a directory or manifest of videos offline, without the web app.
+
+Each video is probed, decoded, transcribed and optionally summarized and
+translated in a pool of worker processes. Every finished file is appended
+to a JSONL checkpoint, so an interrupted run picks up where it stopped.
+
+    python batch.py VIDEO_OR_DIR [...] --output results.jsonl [--summarize] [--language hi]
+    python batch.py --manifest videos.txt --output results.jsonl --workers 4
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+DEFAULT_EXTENSIONS = ('mp4', 'mp3', 'm4a', 'wav', 'ogg')
+
+
+def find_videos(paths, extensions=DEFAULT_EXTENSIONS):
+    """Expand files and directories (searched recursively) into video paths"""
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                videos.extend(os.path.join(root, name) for name in sorted(names)
+                              if name.rsplit('.', 1)[-1].lower() in extensions)
+        else:
+            videos.append(path)
+    return videos
+
+
+def read_manifest(manifest_path):
+    """Read video paths from a text manifest (one per line) or JSONL with a ``path`` key"""
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    videos = []
+    with open(manifest_path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            path = json.loads(line)['path'] if line.startswith('{') else line
+            videos.append(path if os.path.isabs(path) else os.path.join(base, path))
+    return videos
+
+
+def file_key(path):
+    """Identify a file version by path, size and modification time"""
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def load_checkpoint(output_path):
+    """Return the checkpoint records of files that already finished successfully"""
+    done = {}
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # A line cut short by an interrupted run
+            if record.get('success'):
+                done[record['key']] = record
+    return done
+
+
+def process_video(path, key, options):
+    """
+    Run the processing chain on one video inside a worker process.
+
+    Returns:
+        dict: Checkpoint record with the results, stage timings and any error.
+    """
+    from audio_processor import MediaSource
+    from transcription_service import transcribe_segments, get_recognizer
+    from summarization_service import hybrid_summarize_advanced
+    from translation_service import translate_segments
+    from transcript_segments import segments_text, locate_sentences
+
+    record = {'key': key, 'path': path, 'success': False, 'timings': {}}
+    timings = record['timings']
+
+    def stage(name, func, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings[name] = round(time.perf_counter() - start, 3)
+
+    try:
+        source = MediaSource(path)
+        record['duration'] = stage('probe', lambda: source.duration)
+        if options['max_duration'] and record['duration'] > options['max_duration']:
+            raise Exception(f"Video is longer than {options['max_duration']} seconds")
+
+        pcm_data = stage('extract_audio', source.read_pcm)
+        segments = stage('transcribe', transcribe_segments, pcm_data,
+                         recognizer=get_recognizer(options['recognizer']),
+                         max_workers=options['recognition_concurrency'])
+        del pcm_data
+        record['segments'] = segments
+        record['transcript'] = segments_text(segments)
+
+        language = options['language']
+        if options['summarize']:
+            record['summary'] = stage('summarize', hybrid_summarize_advanced, record['transcript'])
+            record['summary_segments'] = locate_sentences(record['summary'], segments)
+        if language and language != 'en':
+            translated = stage('translate', translate_segments, segments, language)
+            if translated is None:
+                raise Exception("Translation unavailable")
+            record['segments_target'] = translated
+            record['transcript_target'] = segments_text(translated)
+            if options['summarize']:
+                translated_summary = stage('translate_summary', translate_segments,
+                                           record['summary_segments'], language)
+                if translated_summary is not None:
+                    record['summary_target'] = segments_text(translated_summary)
+
+        record['success'] = True
+    except Exception as e:
+        record['error'] = str(e)
+    return record
+
+
+def configure_stage_concurrency(args):
+    """Export per-stage settings before the worker processes import the services"""
+    os.environ['RECOGNITION_CONCURRENCY'] = str(args.recognition_concurrency)
+    os.environ['TRANSLATION_CONCURRENCY'] = str(args.translation_concurrency)
+    os.environ['SUMMARY_WORKERS'] = str(args.summary_workers)
+    # Each worker has its own token bucket, so share the request rate out
+    os.environ['TRANSLATION_RATE'] = str(args.translation_rate / args.workers)
+
+
+def format_throughput(videos, audio_seconds, elapsed):
+    elapsed = max(elapsed, 1e-9)
+    return (f"{videos / elapsed * 3600:.1f} videos/hour, "
+            f"{audio_seconds / elapsed:.2f} audio-seconds/second")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paths', nargs='*', help='Video files or directories')
+    parser.add_argument('--manifest', help='Text file of video paths (or JSONL with a "path" key)')
+    parser.add_argument('--output', required=True, help='JSONL results file, also used as the checkpoint')
+    parser.add_argument('--summarize', action='store_true', help='Summarize each transcript')
+    parser.add_argument('--language', help='Translate results to this language code')
+    parser.add_argument('--extensions', default=','.join(DEFAULT_EXTENSIONS))
+    parser.add_argument('--max-duration', type=float, default=0, help='Skip longer videos (seconds)')
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help='Videos processed in parallel (worker processes)')
+    parser.add_argument('--recognizer', help='Speech recognition backend (google, vosk, whisper)')
+    parser.add_argument('--recognition-concurrency', type=int, default=4,
+                        help='Concurrent recognition requests per video')
+    parser.add_argument('--translation-concurrency', type=int, default=4,
+                        help='Concurrent translation batches per video')
+    parser.add_argument('--translation-rate', type=float, default=5,
+                        help='Translation requests per second across all workers')
+    parser.add_argument('--summary-workers', type=int, default=1,
+                        help='Processes per video for hierarchical summarization')
+    args = parser.parse_args(argv)
+
+    videos = find_videos(args.paths, tuple(args.extensions.split(',')))
+    if args.manifest:
+        videos.extend(read_manifest(args.manifest))
+    if not videos:
+        parser.error('no videos given')
+
+    done = load_checkpoint(args.output)
+    pending = []
+    for path in dict.fromkeys(videos):
+        if not os.path.exists(path):
+            print(f"⚠️ Skipping missing file {path}")
+            continue
+        key = file_key(path)
+        if key not in done:
+            pending.append((path, key))
+    print(f"📂 {len(videos)} video(s), {len(videos) - len(pending)} already done, {len(pending)} to process")
+    if not pending:
+        return 0
+
+    configure_stage_concurrency(args)
+    options = {
+        'summarize': args.summarize,
+        'language': args.language,
+        'max_duration': args.max_duration,
+        'recognizer': args.recognizer,
+        'recognition_concurrency': args.recognition_concurrency,
+    }
+
+    processed, failed, audio_seconds = 0, 0, 0.0
+    interrupted = False
+    start = time.perf_counter()
+    context = multiprocessing.get_context('spawn')
+    executor = ProcessPoolExecutor(max_workers=args.workers, mp_context=context)
+    try:
+        with open(args.output, 'a', encoding='utf-8') as output:
+            futures = {executor.submit(process_video, path, key, options): (path, key) for path, key in pending}
+            for future in as_completed(futures):
+                path, key = futures[future]
+                try:
+                    record = future.result()
+                except Exception as e:
+                    record = {'key': key, 'path': path, 'success': False, 'error': str(e)}
+
+                output.write(json.dumps(record, ensure_ascii=False) + '\n')
+                output.flush()
+                os.fsync(output.fileno())
+
+                processed += 1
+                if record['success']:
+                    audio_seconds += record.get('duration') or 0
+                    print(f"✅ [{processed}/{len(pending)}] {path} "
+                          f"({record.get('duration', 0):.0f}s audio) - "
+                          f"{format_throughput(processed - failed, audio_seconds, time.perf_counter() - start)}")
+                else:
+                    failed += 1
+                    print(f"❌ [{processed}/{len(pending)}] {path}: {record.get('error')}")
+    except KeyboardInterrupt:
+        interrupted = True
+        print("\n⏹️ Interrupted; finished files are checkpointed and will be skipped next run")
+        return 130
+    finally:
+        executor.shutdown(wait=not interrupted, cancel_futures=interrupted)
+
+    elapsed = time.perf_counter() - start
+    print(f"🏁 {processed - failed} succeeded, {failed} failed in {elapsed:.1f}s: "
+          f"{format_throughput(processed - failed, audio_seconds, elapsed)}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
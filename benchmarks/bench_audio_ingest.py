@@ -0,0 +1,86 @@
+"""
+Peak memory of converting long audio files to recognizer-ready WAV.
+
+Compares the streaming conversion behind convert_to_wav, which decodes in
+fixed-size blocks straight to 16 kHz mono PCM, with the previous pydub
+path that loaded the whole file into an AudioSegment before exporting it.
+Each conversion runs in a fresh process so its peak RSS, and that of its
+ffmpeg children, is measured in isolation.
+
+    python benchmarks/bench_audio_ingest.py [--seconds 3600] [--formats wav,mp3,m4a,ogg]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import build_audio_corpus  # noqa: E402
+from bench_e2e import peak_rss_mb  # noqa: E402
+
+
+def legacy_convert(audio_path, wav_path):
+    """The pre-streaming convert_to_wav: decode everything into memory, then export
+
+    ``AudioSegment.from_file`` needs ffprobe; without it pydub's temporary
+    file loader is used, which holds the decoded audio in memory the same way.
+    """
+    from pydub import AudioSegment
+    load = AudioSegment.from_file if shutil.which('ffprobe') else AudioSegment.from_file_using_temporary_files
+    load(audio_path).export(wav_path, format='wav')
+
+
+def streaming_convert(audio_path, wav_path):
+    from audio_processor import MediaSource
+    MediaSource(audio_path).write_wav(wav_path)
+
+
+METHODS = {'pydub': legacy_convert, 'streaming': streaming_convert}
+
+
+def run_child(method, audio_path):
+    """Convert once in this process and print timing and peak RSS as JSON"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        start = time.perf_counter()
+        METHODS[method](audio_path, os.path.join(temp_dir, 'out.wav'))
+        elapsed = time.perf_counter() - start
+    print(json.dumps(dict(peak_rss_mb(), seconds=elapsed)))
+
+
+def measure(method, audio_path):
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', method, audio_path],
+                            stdout=subprocess.PIPE, check=True).stdout
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=int, default=3600, help='Length of each audio file')
+    parser.add_argument('--formats', default='wav,mp3,m4a,ogg')
+    parser.add_argument('--corpus-dir', default=os.path.join(tempfile.gettempdir(), 'video-summarizer-corpus'))
+    parser.add_argument('--child', nargs=2, metavar=('METHOD', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    print(f"🎧 Building {args.seconds}s audio files in {args.corpus_dir}...")
+    paths = build_audio_corpus(args.corpus_dir, args.seconds, args.formats.split(','))
+
+    print(f"{'format':>7} {'method':>10} {'time (s)':>9} {'python RSS (MB)':>16} {'ffmpeg RSS (MB)':>16}")
+    for path in paths:
+        extension = os.path.splitext(path)[1][1:]
+        for method in METHODS:
+            result = measure(method, path)
+            print(f"{extension:>7} {method:>10} {result['seconds']:9.2f} {result['self']:16.0f} "
+                  f"{result['children']:16.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Near-duplicate sentence elimination on repetitive transcripts.
+
+Times MinHash/LSH deduplication on growing sentence counts to show it
+scales about linearly, then summarizes transcripts where sentences recur
+with small variations (as in lectures that repeat their key points), with
+and without deduplication. Translation always keeps every sentence, so it
+is not part of this benchmark.
+
+    python benchmarks/bench_dedup.py [--sizes 1000,4000,16000] [--repeat-share 0.4]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dedup  # noqa: E402
+from bench_summarization import make_transcript, best_of  # noqa: E402
+from text_pipeline import clean_sentences  # noqa: E402
+from summarization_service import hybrid_summarize_advanced  # noqa: E402
+
+OPENERS = ['So', 'Again', 'Remember', 'Okay so', 'As I said']
+
+
+def vary(sentence, rng):
+    """Restate a sentence the way a speaker repeats a point"""
+    words = sentence.rstrip('.').split()
+    choice = rng.random()
+    if choice < 0.4:
+        return f"{rng.choice(OPENERS)} {words[0].lower()} {' '.join(words[1:])}."
+    if choice < 0.7 and len(words) > 8:
+        del words[rng.randrange(1, len(words))]
+        return ' '.join(words) + '.'
+    return sentence.rstrip('.') + '!'
+
+
+def repetitive_sentences(count, repeat_share, seed=0):
+    """``count`` sentences of which ``repeat_share`` restate an earlier one"""
+    rng = random.Random(seed)
+    fresh = clean_sentences(make_transcript(count * 14, seed=seed))
+    sentences = []
+    while len(sentences) < count and fresh:
+        if sentences and rng.random() < repeat_share:
+            sentences.append(vary(rng.choice(sentences), rng))
+        else:
+            sentences.append(fresh.pop())
+    return sentences
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,4000,16000', help='Sentence counts for the scaling run')
+    parser.add_argument('--sentences', type=int, default=1500, help='Sentences per repetitive transcript')
+    parser.add_argument('--repeat-share', type=float, default=0.4, help='Share of restated sentences')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'sentences':>10} {'dedup (s)':>10} {'us/sentence':>12} {'duplicates':>11}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        sentences = repetitive_sentences(size, args.repeat_share)
+        elapsed = best_of(lambda: dedup.near_duplicates(sentences), args.repeat)
+        found = len(sentences) - len(dedup.unique_sentences(sentences))
+        print(f"{len(sentences):>10} {elapsed:10.3f} {elapsed / len(sentences) * 1e6:12.1f} {found:>11}")
+
+    sentences = repetitive_sentences(args.sentences, args.repeat_share, seed=1)
+    text = ' '.join(sentences)
+    print(f"\n{len(sentences)} sentences, {args.repeat_share:.0%} restated")
+    print(f"{'':>9} {'summarize (s)':>14} {'summary words':>14}")
+    for enabled in (False, True):
+        dedup.DEDUP_ENABLED = enabled
+        summarize_time = best_of(lambda: hybrid_summarize_advanced(text), args.repeat)
+        summary = hybrid_summarize_advanced(text)
+        print(f"{'dedup' if enabled else 'no dedup':>9} {summarize_time:14.3f} {len(summary.split()):14d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+"""
+End-to-end benchmark of the processing chain with local stand-ins.
+
+Builds a synthetic MP4/WAV corpus, replaces speech recognition with a fake
+recognizer and translation with a local HTTP stub, then measures:
+
+* per-stage latency (probe, decode, VAD, transcribe, summarize, translate)
+* throughput and latency of /transcribe and /summarize under concurrent load
+* peak RSS of this process and its ffmpeg children
+
+Results are written as JSON; pass ``--compare`` an earlier file to see
+regressions across commits.
+
+    python benchmarks/bench_e2e.py --output bench.json [--compare baseline.json]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import build_corpus  # noqa: E402
+from stubs import TranslationStub, FakeRecognizer  # noqa: E402
+
+REGRESSION_THRESHOLD = 0.10  # Flag metrics that get more than 10% worse
+
+
+def summarize_latencies(samples):
+    samples = sorted(samples)
+    return {
+        'count': len(samples),
+        'mean': statistics.mean(samples),
+        'p50': samples[len(samples) // 2],
+        'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process and of waited-for children, in MB"""
+    scale = 1024.0 * 1024 if sys.platform == 'darwin' else 1024.0
+    return {
+        'self': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale,
+        'children': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, check=True,
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_stages(corpus, repeat, language):
+    """Time each stage of the chain directly on every corpus file"""
+    from audio_processor import MediaSource, probe_media, detect_speech
+    from transcription_service import transcribe_segments
+    from summarization_service import hybrid_summarize_advanced
+    from translation_service import translate_segments
+    from transcript_segments import segments_text
+
+    timings = {}
+
+    def timed(stage, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings.setdefault(stage, []).append(time.perf_counter() - start)
+        return result
+
+    for _ in range(repeat):
+        for seconds, mp4_path, wav_path in corpus:
+            timed('probe_mp4', probe_media, mp4_path)
+            timed('probe_wav', probe_media, wav_path)
+            pcm_data = timed('decode_audio', MediaSource(mp4_path).read_pcm)
+            timed('vad', detect_speech, pcm_data)
+            segments = timed('transcribe', transcribe_segments, pcm_data)
+            timed('summarize', hybrid_summarize_advanced, segments_text(segments))
+            timed('translate', translate_segments, segments, language)
+    return {stage: summarize_latencies(samples) for stage, samples in timings.items()}
+
+
+def bench_load(app, corpus, concurrency, requests_per_level, language):
+    """Post corpus videos to the synchronous routes from concurrent clients"""
+    from werkzeug.serving import make_server
+    import requests
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    def post(index):
+        seconds, mp4_path, _ = corpus[index % len(corpus)]
+        endpoint = '/summarize' if index % 2 else '/transcribe'
+        start = time.perf_counter()
+        with open(mp4_path, 'rb') as f:
+            response = requests.post(base_url + endpoint, data={'language': language},
+                                     files={'video': (os.path.basename(mp4_path), f, 'video/mp4')})
+        ok = response.status_code == 200 and response.json().get('success')
+        return time.perf_counter() - start, seconds, ok
+
+    results = {}
+    try:
+        for level in concurrency:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=level) as executor:
+                outcomes = list(executor.map(post, range(requests_per_level)))
+            elapsed = time.perf_counter() - start
+            latencies = [latency for latency, _, ok in outcomes if ok]
+            audio_seconds = sum(seconds for _, seconds, ok in outcomes if ok)
+            results[str(level)] = dict(
+                summarize_latencies(latencies) if latencies else {'count': 0},
+                errors=sum(1 for _, _, ok in outcomes if not ok),
+                requests_per_second=len(latencies) / elapsed,
+                audio_seconds_per_second=audio_seconds / elapsed,
+            )
+    finally:
+        server.shutdown()
+    return results
+
+
+def flatten(results, prefix=''):
+    """Flatten nested numeric results into ``a.b.c`` keys"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def higher_is_better(metric):
+    return metric.endswith('per_second')
+
+
+def compare(current, baseline):
+    """Print metrics that changed by more than REGRESSION_THRESHOLD"""
+    now, before = flatten(current['results']), flatten(baseline['results'])
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    regressions = 0
+    for metric in sorted(set(now) & set(before)):
+        if metric.endswith('.count') or not before[metric]:
+            continue
+        change = (now[metric] - before[metric]) / before[metric]
+        worse = -change if higher_is_better(metric) else change
+        if abs(change) > REGRESSION_THRESHOLD:
+            marker = '🔴 regression' if worse > 0 else '🟢 improvement'
+            regressions += worse > 0
+            print(f"  {marker:>15} {metric}: {before[metric]:.4g} -> {now[metric]:.4g} ({change:+.0%})")
+    if not regressions:
+        print("  no regressions")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', default='bench_e2e.json', help='JSON results file')
+    parser.add_argument('--compare', help='Earlier results file to compare against')
+    parser.add_argument('--corpus-dir', default=os.path.join(tempfile.gettempdir(), 'video-summarizer-corpus'))
+    parser.add_argument('--durations', default='30,120,300', help='Corpus video lengths in seconds')
+    parser.add_argument('--repeat', type=int, default=3, help='Passes over the corpus for stage timings')
+    parser.add_argument('--concurrency', default='1,4,8', help='Concurrent clients per load level')
+    parser.add_argument('--requests', type=int, default=16, help='Requests per load level')
+    parser.add_argument('--language', default='hi')
+    parser.add_argument('--recognizer-latency', type=float, default=0.02)
+    parser.add_argument('--translation-latency', type=float, default=0.05)
+    parser.add_argument('--translation-failure-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = {key: value for key, value in vars(args).items() if key not in ('output', 'compare', 'corpus_dir')}
+    durations = [int(d) for d in args.durations.split(',')]
+    concurrency = [int(c) for c in args.concurrency.split(',')]
+
+    print(f"🎬 Building corpus in {args.corpus_dir}...")
+    corpus = build_corpus(args.corpus_dir, durations)
+
+    stub = TranslationStub(latency=args.translation_latency,
+                           failure_rate=args.translation_failure_rate).start()
+    upload_dir = tempfile.mkdtemp(prefix='bench-uploads-')
+
+    # Services read their settings at import time
+    os.environ.update({
+        'RECOGNIZER_BACKEND': 'fake',
+        'TRANSLATION_BACKEND': 'http',
+        'TRANSLATION_BACKEND_URL': stub.url,
+        'TRANSLATION_MEMORY_PATH': '',     # Memory only; transcripts never repeat anyway
+        'RESULT_CACHE_MAX_BYTES': '0',     # Every request does the full work
+        'WARM_UP': 'false',
+    })
+    import transcription_service
+    transcription_service.RECOGNIZER_BACKENDS['fake'] = lambda: FakeRecognizer(args.recognizer_latency)
+    import app as app_module
+    app_module.app.config['UPLOAD_FOLDER'] = upload_dir
+    application = app_module.create_app()
+
+    results = {}
+    try:
+        print("⏱️ Timing stages...")
+        results['stages'] = bench_stages(corpus, args.repeat, args.language)
+        print("🚦 Running load levels...")
+        results['load'] = bench_load(application, corpus, concurrency, args.requests, args.language)
+    finally:
+        stub.stop()
+    results['peak_rss_mb'] = peak_rss_mb()
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'config': config,
+        'translation_stub': {'requests': stub.requests, 'failures': stub.failures},
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'stage':>14} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+    for stage, stats in results['stages'].items():
+        print(f"{stage:>14} {stats['p50'] * 1000:10.1f} {stats['p95'] * 1000:10.1f}")
+    print(f"\n{'clients':>8} {'req/s':>8} {'audio s/s':>10} {'p50 (s)':>8} {'p95 (s)':>8} {'errors':>7}")
+    for level, stats in results['load'].items():
+        print(f"{level:>8} {stats['requests_per_second']:8.2f} {stats['audio_seconds_per_second']:10.1f} "
+              f"{stats.get('p50', 0):8.2f} {stats.get('p95', 0):8.2f} {stats['errors']:>7}")
+    rss = results['peak_rss_mb']
+    print(f"\npeak RSS: {rss['self']:.0f} MB (children {rss['children']:.0f} MB); results in {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            return 1 if compare(report, json.load(f)) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Tail latency and fail-fast behaviour of outbound calls against a local stub.
+
+Tail: single-sentence translations are sent from concurrent clients to a
+stub where a small share of requests is very slow, with and without
+hedging, and p50/p95/p99 latencies and the extra requests are compared.
+
+Degraded backend: a transcript is translated sentence by sentence while
+every request times out, with and without the circuit breaker.
+
+    python benchmarks/bench_outbound.py [--requests 600] [--slow-rate 0.03]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stubs import TranslationStub  # noqa: E402
+from bench_e2e import summarize_latencies  # noqa: E402
+from outbound import OutboundService, CircuitBreaker, DeadlineExceeded  # noqa: E402
+from translation_service import HTTPBackend, TranslationEngine  # noqa: E402
+
+
+def percentile(samples, percent):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * percent / 100.0))]
+
+
+def run_tail(args, hedging):
+    stub = TranslationStub(latency=args.latency, jitter=args.latency / 4, slow_rate=args.slow_rate,
+                           slow_latency=args.slow_latency).start()
+    backend = HTTPBackend(stub.url, timeout=args.deadline)
+    service = OutboundService(f"tail-{'hedged' if hedging else 'plain'}", deadline=args.deadline,
+                              hedging=hedging, max_workers=args.clients * 4)
+
+    def translate(index):
+        start = time.perf_counter()
+        try:
+            service.call(backend.translate, f"Sentence number {index}.", 'hi')
+        except DeadlineExceeded:
+            pass  # Counted at the deadline
+        return time.perf_counter() - start
+
+    try:
+        with ThreadPoolExecutor(max_workers=args.clients) as executor:
+            latencies = list(executor.map(translate, range(args.requests)))
+    finally:
+        stub.stop()
+    return latencies, stub.requests, service.stats()
+
+
+def run_degraded(args, breaker):
+    # Every request is slower than the deadline
+    stub = TranslationStub(latency=args.deadline * 4, jitter=0).start()
+    threshold = 5 if breaker else 10 ** 9
+    service = OutboundService(f"degraded-{'breaker' if breaker else 'none'}", deadline=args.deadline,
+                              hedging=False, breaker=CircuitBreaker(failure_threshold=threshold))
+    engine = TranslationEngine(HTTPBackend(stub.url, timeout=args.deadline), max_workers=4, rate=1000,
+                               burst=1000, max_batch_chars=1, outbound=service)
+    sentences = [f"Sentence number {i}." for i in range(args.sentences)]
+    start = time.perf_counter()
+    try:
+        translated = engine.translate_sentences(sentences, 'hi')
+    finally:
+        elapsed = time.perf_counter() - start
+        stub.stop()
+    return elapsed, sum(1 for t in translated if t), stub.requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=600)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.02, help='Typical stub latency (s)')
+    parser.add_argument('--slow-rate', type=float, default=0.03, help='Share of very slow requests')
+    parser.add_argument('--slow-latency', type=float, default=1.0, help='Latency of slow requests (s)')
+    parser.add_argument('--deadline', type=float, default=2.0, help='Per-call deadline (s)')
+    parser.add_argument('--sentences', type=int, default=60, help='Sentences in the degraded run')
+    args = parser.parse_args()
+
+    print(f"Tail: {args.requests} requests, {args.clients} clients, "
+          f"{args.slow_rate:.0%} of requests take {args.slow_latency:g}s")
+    print(f"{'':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9} {'requests':>9} {'hedge wins':>11}")
+    for hedging in (False, True):
+        latencies, requests, stats = run_tail(args, hedging)
+        summary = summarize_latencies(latencies)
+        print(f"{'hedged' if hedging else 'plain':>8} {summary['p50'] * 1000:9.1f} {summary['p95'] * 1000:9.1f} "
+              f"{percentile(latencies, 99) * 1000:9.1f} {max(latencies) * 1000:9.1f} "
+              f"{requests:9d} {stats['hedge_wins']:11d}")
+
+    print(f"\nDegraded backend: {args.sentences} sentences, every request slower than the {args.deadline:g}s deadline")
+    for breaker in (False, True):
+        elapsed, translated, requests = run_degraded(args, breaker)
+        print(f"{'breaker' if breaker else 'no breaker':>11}: {elapsed:6.2f}s, "
+              f"{requests} backend requests, {translated} translated")
+
+
+if __name__ == '__main__':
+    main()
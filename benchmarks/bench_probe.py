@@ -0,0 +1,62 @@
+"""
+Duration probe cost: header-only MP4 parse versus opening a VideoFileClip.
+
+The legacy path constructs a full moviepy VideoFileClip just to read its
+duration, which spawns ffmpeg and sets up a frame reader for every file.
+
+    python benchmarks/bench_probe.py VIDEO [...] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_processor import probe_media, probe_ffprobe  # noqa: E402
+
+
+def legacy_duration(path):
+    from moviepy.editor import VideoFileClip
+    video = VideoFileClip(path)
+    duration = video.duration
+    video.close()
+    return duration
+
+
+def measure(func, path, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(path)
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paths', nargs='+', help='Media files to probe')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'probe':>14} {'ms/call':>10} {'duration (s)':>13}  file")
+    probes = [
+        ('probe_media', lambda p: probe_media(p).duration, args.repeat),
+        ('ffprobe', lambda p: probe_ffprobe(p).duration, args.repeat),
+        # The legacy open is slow enough that a few runs are representative
+        ('VideoFileClip', legacy_duration, max(1, args.repeat // 5)),
+    ]
+    for path in args.paths:
+        results = {}
+        for name, func, repeat in probes:
+            try:
+                seconds, duration = measure(func, path, repeat)
+            except Exception as e:
+                print(f"{name:>14} {'failed':>10} {'':>13}  {os.path.basename(path)} ({type(e).__name__})")
+                continue
+            results[name] = seconds
+            print(f"{name:>14} {seconds * 1000:10.2f} {duration:13.2f}  {os.path.basename(path)}")
+        if 'VideoFileClip' in results:
+            print(f"{'speedup':>14} {results['VideoFileClip'] / results['probe_media']:9.0f}x")
+        print()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Real-time factor of each speech-recognition backend on the same WAV files.
+
+The real-time factor (RTF) is processing time divided by audio duration;
+below 1.0 means faster than real time. Each backend's model load is timed
+separately so it does not skew the per-file numbers.
+
+    python benchmarks/bench_recognizers.py WAV_OR_DIR [...] [--backends google,vosk,whisper]
+"""
+import argparse
+import os
+import sys
+import time
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transcription_service import RECOGNIZER_BACKENDS, get_recognizer, transcribe_audio  # noqa: E402
+
+
+def find_wavs(paths):
+    wavs = []
+    for path in paths:
+        if os.path.isdir(path):
+            wavs.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.wav'))
+        else:
+            wavs.append(path)
+    return wavs
+
+
+def wav_duration(path):
+    with wave.open(path, 'rb') as wav_file:
+        return wav_file.getnframes() / float(wav_file.getframerate())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paths', nargs='+', help='WAV files or directories of WAV files')
+    parser.add_argument('--backends', default=','.join(RECOGNIZER_BACKENDS))
+    args = parser.parse_args()
+
+    wavs = find_wavs(args.paths)
+    if not wavs:
+        parser.error('no WAV files found')
+    total_audio = sum(wav_duration(path) for path in wavs)
+    print(f"{len(wavs)} file(s), {total_audio:.1f} s of audio\n")
+    print(f"{'backend':>10} {'load (s)':>9} {'process (s)':>12} {'RTF':>7} {'words':>7}")
+
+    for name in args.backends.split(','):
+        recognizer = get_recognizer(name)
+        load_time = 0.0
+        try:
+            if hasattr(recognizer, 'load'):
+                start = time.perf_counter()
+                recognizer.load()
+                load_time = time.perf_counter() - start
+        except Exception as e:
+            print(f"{name:>10} skipped: {e}")
+            continue
+
+        words, failures = 0, 0
+        start = time.perf_counter()
+        for path in wavs:
+            try:
+                words += len(transcribe_audio(path, recognizer=recognizer).split())
+            except Exception:
+                failures += 1
+        elapsed = time.perf_counter() - start
+        note = f" ({failures} failed)" if failures else ""
+        print(f"{name:>10} {load_time:9.2f} {elapsed:12.2f} {elapsed / total_audio:7.3f} {words:>7}{note}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Cold-start cost: import time, warm-up and first-request latency.
+
+Each run starts a fresh interpreter, imports the app, optionally runs
+create_app()'s warm-up, then times the first page load and the first
+summary through the Flask test client. Runs with and without warm-up show
+how much first-request latency the preload moves to startup.
+
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r'''
+import json, os, sys, time
+start = time.perf_counter()
+import app as app_module
+imported = time.perf_counter()
+application = app_module.create_app()
+created = time.perf_counter()
+client = application.test_client()
+client.get('/')
+first_page = time.perf_counter()
+app_module.summarize_text(app_module.WARM_UP_TEXT + " The exam is in the last week of term.")
+first_summary = time.perf_counter()
+print(json.dumps({
+    'import': imported - start,
+    'create_app': created - imported,
+    'first_page': first_page - created,
+    'first_summary': first_summary - first_page,
+}))
+'''
+
+
+def run_once(warm):
+    env = dict(os.environ, WARM_UP='true' if warm else 'false')
+    output = subprocess.run([sys.executable, '-c', CHILD], cwd=ROOT, env=env, check=True,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout
+    return json.loads(output.decode('utf8').strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='print medians as JSON')
+    args = parser.parse_args()
+
+    results = {}
+    for warm in (False, True):
+        runs = [run_once(warm) for _ in range(args.runs)]
+        results['warm' if warm else 'cold'] = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"median of {args.runs} run(s), milliseconds\n")
+    print(f"{'':>6} {'import':>9} {'create_app':>11} {'first page':>11} {'first summary':>14}")
+    for name, timings in results.items():
+        print(f"{name:>6} {timings['import'] * 1000:9.0f} {timings['create_app'] * 1000:11.0f} "
+              f"{timings['first_page'] * 1000:11.0f} {timings['first_summary'] * 1000:14.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Summarization latency on synthetic 1k-50k word transcripts.
+
+Compares the vectorized engine behind hybrid_summarize_advanced with the
+previous per-call sumy LSA pipeline. Sumy's default tokenizer needs the
+NLTK punkt data, so the legacy path is timed with a regex tokenizer that
+produces the same sentences as the engine.
+
+    python benchmarks/bench_summarization.py [--sizes 1000,5000,...] [--repeat N]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from summarization_service import hybrid_summarize_advanced, preprocess_text  # noqa: E402
+
+VOCABULARY = (
+    "today we will talk about machine learning models data training networks layers "
+    "gradient descent optimization loss function accuracy validation test set features "
+    "language speech audio video transcript summary translation people world project "
+    "important example result problem solution approach system performance memory time"
+).split()
+FILLERS = "the a of and to in is that it for on with as this we you".split()
+SYLLABLES = "ka lo mi ra ten sor vi pal den gra tu ser mon cli bra fe".split()
+
+
+def make_transcript(word_count, seed=0, vocabulary_size=3000):
+    """Generate a deterministic transcript of roughly ``word_count`` words"""
+    rng = random.Random(seed)
+    vocabulary = VOCABULARY + [
+        ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(vocabulary_size)]
+    # Zipf-like weights so a few content words dominate, as in real speech
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    sentences, total = [], 0
+    while total < word_count:
+        length = rng.randint(6, 22)
+        words = [rng.choices(vocabulary, weights)[0] if rng.random() < 0.6 else rng.choice(FILLERS)
+                 for _ in range(length)]
+        sentences.append(' '.join(words) + '.')
+        total += length
+    return ' '.join(sentences)
+
+
+class RegexTokenizer:
+    """Punkt-free stand-in for sumy's Tokenizer"""
+
+    language = "english"
+
+    def to_sentences(self, paragraph):
+        return [s.strip() for s in re.findall(r'[^.!?]+[.!?]*', paragraph) if s.strip()]
+
+    def to_words(self, sentence):
+        return re.findall(r"[A-Za-z0-9']+", sentence)
+
+
+def legacy_lsa(text, sentence_count=3):
+    """The pre-engine advanced_summarize: fresh sumy objects on every call"""
+    from sumy.parsers.plaintext import PlaintextParser
+    from sumy.summarizers.lsa import LsaSummarizer
+    from sumy.nlp.stemmers import Stemmer
+    from sumy.utils import get_stop_words
+
+    parser = PlaintextParser.from_string(text, RegexTokenizer())
+    summarizer = LsaSummarizer(Stemmer("english"))
+    summarizer.stop_words = get_stop_words("english")
+    return [str(s) for s in summarizer(parser.document, sentence_count + 2)]
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,5000,10000,25000,50000')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--legacy-limit', type=int, default=10000,
+                        help='largest size to time with the legacy sumy LSA pipeline')
+    args = parser.parse_args()
+
+    print(f"{'words':>8} {'engine (s)':>12} {'legacy LSA (s)':>15}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        text = make_transcript(size)
+        engine_time = best_of(lambda: hybrid_summarize_advanced(text), args.repeat)
+        if size <= args.legacy_limit:
+            cleaned = preprocess_text(text)
+            legacy = f"{best_of(lambda: legacy_lsa(cleaned), args.repeat):15.3f}"
+        else:
+            legacy = f"{'skipped':>15}"
+        print(f"{size:>8} {engine_time:12.3f} {legacy}")
+
+
+if __name__ == '__main__':
+    main()
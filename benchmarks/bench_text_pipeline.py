@@ -0,0 +1,135 @@
+"""
+Text preprocessing cost on 100k-character transcripts.
+
+Times the previous per-service cleanup (five re.sub passes plus split/join
+for summarization, str.replace passes for translation, character-by-
+character sentence splitting and the list-scan summary ordering) against
+the shared text_pipeline. Transcripts mimic recognizer output:
+mostly lowercase, with stray whitespace and standalone "i".
+
+    python benchmarks/bench_text_pipeline.py [--chars 100000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_summarization import make_transcript  # noqa: E402
+import text_pipeline  # noqa: E402
+from summarization_service import preprocess_text  # noqa: E402
+from translation_service import clean_text  # noqa: E402
+
+
+def make_raw_transcript(chars, seed=0):
+    """Synthetic transcript of about ``chars`` characters with recognizer quirks"""
+    rng = random.Random(seed)
+    words = make_transcript(chars // 5, seed=seed).split()
+    quirks = ['i', "i'm", "i've", "i'll", "i'd"]
+    noisy = []
+    for word in words:
+        if rng.random() < 0.03:
+            noisy.append(rng.choice(quirks))
+        noisy.append(word)
+        if rng.random() < 0.05:
+            noisy.append(rng.choice(['', '\n', '\t']))
+    return ' '.join(noisy)[:chars]
+
+
+def legacy_preprocess_text(text):
+    text = re.sub(r'\bi\b', 'I', text)
+    text = re.sub(r" i'm ", " I'm ", text)
+    text = re.sub(r" i've ", " I've ", text)
+    text = re.sub(r" i'll ", " I'll ", text)
+    text = re.sub(r" i'd ", " I'd ", text)
+    text = ' '.join(text.split())
+    cleaned_sentences = []
+    for sentence in text.split('. '):
+        sentence = sentence.strip()
+        if sentence:
+            if sentence[0].islower():
+                sentence = sentence[0].upper() + sentence[1:]
+            if not sentence.endswith('.'):
+                sentence += '.'
+            cleaned_sentences.append(sentence)
+    return ' '.join(cleaned_sentences)
+
+
+def legacy_clean_text(text):
+    text = ' '.join(str(text).strip().split())
+    for wrong, correct in {' i ': ' I ', " i'm ": " I'm ", " i've ": " I've ",
+                           " i'll ": " I'll ", " i'd ": " I'd "}.items():
+        text = text.replace(wrong, correct)
+    if text and text[-1] not in '.!?':
+        text += '.'
+    if text and text[0].islower():
+        text = text[0].upper() + text[1:]
+    return text
+
+
+def legacy_split_sentences(text):
+    sentences = []
+    current_sentence = ""
+    for char in text:
+        current_sentence += char
+        if char in '.!?':
+            sentences.append(current_sentence.strip())
+            current_sentence = ""
+    if current_sentence.strip():
+        sentences.append(current_sentence.strip())
+    return [s for s in sentences if s]
+
+
+def legacy_translation_prep(text):
+    return [legacy_clean_text(s) for s in legacy_split_sentences(legacy_clean_text(text))]
+
+
+def legacy_summary_order(sentences, top_sentences, top_indices):
+    return [sentence for sentence in sentences if sentence in top_sentences]
+
+
+def indexed_summary_order(sentences, top_sentences, top_indices):
+    return [sentences[i] for i in sorted(top_indices)]
+
+
+def measure(func, *args, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--chars', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_raw_transcript(args.chars)
+    sentences = text_pipeline.split_sentences(preprocess_text(text))
+    count = max(3, len(sentences) // 10)
+    top_indices = list(range(0, len(sentences), max(1, len(sentences) // count)))[:count]
+    top = [sentences[i] for i in top_indices]
+    print(f"{len(text)} characters, {len(sentences)} sentences, best of {args.repeat}\n")
+
+    rows = [
+        ('summarization prep', legacy_preprocess_text, preprocess_text, (text,)),
+        ('translation prep', legacy_translation_prep, text_pipeline.clean_sentences, (text,)),
+        ('clean_text', legacy_clean_text, clean_text, (text,)),
+        ('sentence split', legacy_split_sentences, text_pipeline.sentence_spans, (text,)),
+        ('summary ordering', legacy_summary_order, indexed_summary_order, (sentences, top, top_indices)),
+    ]
+    print(f"{'step':>20} {'legacy (ms)':>12} {'pipeline (ms)':>14} {'speedup':>8}")
+    for name, legacy, current, func_args in rows:
+        legacy_time = measure(legacy, *func_args, repeat=args.repeat)
+        current_time = measure(current, *func_args, repeat=args.repeat)
+        print(f"{name:>20} {legacy_time * 1000:12.2f} {current_time * 1000:14.2f} {legacy_time / current_time:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Synthetic MP4/WAV/audio corpus for the benchmarks, generated locally with ffmpeg.
+
+The audio alternates tone bursts ("speech") with pauses, so voice-activity
+detection, chunk splitting and recognition all have realistic work to do.
+Files are cached by name in the corpus directory and reused across runs.
+"""
+import os
+import subprocess
+
+from moviepy.config import get_setting
+
+# Bursts for two thirds of every 6 s cycle, quieter harmonics on top
+SPEECH_EXPRESSION = ("0.4*sin(2*PI*220*t)*gt(sin(2*PI*t/6),-0.5)"
+                     "+0.1*sin(2*PI*660*t)*gt(sin(2*PI*t/6),-0.5)")
+
+
+def make_video(path, seconds):
+    """Write a small black MP4 with synthetic speech, moov atom first"""
+    subprocess.run([
+        get_setting("FFMPEG_BINARY"), "-v", "error", "-y",
+        "-f", "lavfi", "-i", f"color=c=black:s=160x120:r=5:d={seconds}",
+        "-f", "lavfi", "-i", f"aevalsrc='{SPEECH_EXPRESSION}':s=44100:d={seconds}",
+        "-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac", "-shortest",
+        "-movflags", "+faststart", path,
+    ], check=True)
+
+
+def make_wav(path, seconds):
+    """Write a 16 kHz mono WAV with synthetic speech"""
+    subprocess.run([
+        get_setting("FFMPEG_BINARY"), "-v", "error", "-y",
+        "-f", "lavfi", "-i", f"aevalsrc='{SPEECH_EXPRESSION}':s=16000:d={seconds}",
+        "-ac", "1", "-acodec", "pcm_s16le", path,
+    ], check=True)
+
+
+def make_audio(path, seconds, source=None):
+    """Write a 44.1 kHz stereo audio file with synthetic speech, encoded by extension
+
+    Pass an existing ``source`` recording to transcode it instead, which is
+    much faster than synthesizing long audio again.
+    """
+    audio_input = ["-i", source] if source else [
+        "-f", "lavfi", "-i", f"aevalsrc='{SPEECH_EXPRESSION}':s=44100:d={seconds}"]
+    subprocess.run([
+        get_setting("FFMPEG_BINARY"), "-v", "error", "-y", *audio_input, "-ac", "2", path,
+    ], check=True)
+
+
+def build_corpus(corpus_dir, durations):
+    """
+    Create (or reuse) one MP4 and one WAV per duration.
+
+    Returns:
+        list: (duration, mp4_path, wav_path) tuples.
+    """
+    os.makedirs(corpus_dir, exist_ok=True)
+    corpus = []
+    for seconds in durations:
+        mp4_path = os.path.join(corpus_dir, f"speech_{seconds}s.mp4")
+        wav_path = os.path.join(corpus_dir, f"speech_{seconds}s.wav")
+        if not os.path.exists(mp4_path):
+            make_video(mp4_path, seconds)
+        if not os.path.exists(wav_path):
+            make_wav(wav_path, seconds)
+        corpus.append((seconds, mp4_path, wav_path))
+    return corpus
+
+
+def build_audio_corpus(corpus_dir, seconds, extensions=('wav', 'mp3', 'm4a', 'ogg')):
+    """
+    Create (or reuse) one podcast-style audio file per extension.
+
+    Returns:
+        list: Paths, in the order of ``extensions``.
+    """
+    os.makedirs(corpus_dir, exist_ok=True)
+    master = os.path.join(corpus_dir, f"podcast_{seconds}s.wav")
+    if not os.path.exists(master):
+        make_audio(master, seconds)
+    paths = []
+    for extension in extensions:
+        path = os.path.join(corpus_dir, f"podcast_{seconds}s.{extension}")
+        if not os.path.exists(path):
+            make_audio(path, seconds, source=master)
+        paths.append(path)
+    return paths
@@ -0,0 +1,115 @@
+"""
+Local stand-ins for the external services used by the processing chain.
+
+TranslationStub answers LibreTranslate-style ``POST /translate`` requests
+(what HTTPBackend sends) with configurable latency and failure rate.
+FakeRecognizer returns canned transcripts sized to the audio it is given.
+"""
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from bench_summarization import make_transcript
+
+WORDS_PER_SECOND = 2.5  # Typical speaking rate
+
+
+class TranslationStub:
+    """
+    Translation server on a background thread.
+
+    Every line of ``q`` is returned prefixed with ``<target>`` so results
+    round-trip through batching exactly like a real translation. Requests
+    fail with HTTP 503 at ``failure_rate``, and a ``slow_rate`` share of
+    them takes ``slow_latency`` seconds instead, to give a latency tail.
+    """
+
+    def __init__(self, latency=0.05, jitter=0.02, failure_rate=0.0, slow_rate=0.0, slow_latency=1.0,
+                 host='127.0.0.1', port=0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.requests = 0
+        self.failures = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/translate"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with stub._lock:
+                    stub.requests += 1
+                    delay = max(0.0, stub._rng.gauss(stub.latency, stub.jitter))
+                    failed = stub._rng.random() < stub.failure_rate
+                    if stub._rng.random() < stub.slow_rate:
+                        delay = stub.slow_latency
+                    stub.failures += failed
+                time.sleep(delay)
+                if failed:
+                    try:
+                        self.send_error(503, 'Stubbed failure')
+                    except (BrokenPipeError, ConnectionResetError):
+                        pass
+                    return
+                text = '\n'.join(f"<{body['target']}>{line}" for line in body['q'].split('\n'))
+                data = json.dumps({'translatedText': text}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client gave up on this request
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FakeRecognizer:
+    """
+    Recognizer backend returning deterministic transcripts.
+
+    Each call returns about WORDS_PER_SECOND words per second of audio,
+    after sleeping ``latency`` plus ``realtime_factor`` times the audio
+    length to mimic a remote or CPU-bound recognizer. Every call gets a
+    different transcript, so nothing downstream is served from a cache.
+    """
+
+    _calls = itertools.count()
+
+    def __init__(self, latency=0.02, realtime_factor=0.01):
+        self.latency = latency
+        self.realtime_factor = realtime_factor
+
+    def recognize(self, audio_data):
+        seconds = len(audio_data.frame_data) / float(audio_data.sample_rate * audio_data.sample_width)
+        time.sleep(self.latency + seconds * self.realtime_factor)
+        word_count = max(1, int(seconds * WORDS_PER_SECOND))
+        return ' '.join(make_transcript(word_count, seed=next(self._calls)).split()[:word_count])
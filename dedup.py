@@ -0,0 +1,136 @@
+import os
+import re
+import numpy as np
+
+# Near-duplicate detection settings
+DEDUP_ENABLED = os.environ.get('DEDUP_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+DEDUP_THRESHOLD = float(os.environ.get('DEDUP_THRESHOLD', 0.85))  # Estimated Jaccard similarity
+SHINGLE_SIZE = 5        # Characters per shingle
+NUM_PERMUTATIONS = 128  # MinHash signature length
+LSH_BANDS = 16          # Bands of NUM_PERMUTATIONS // LSH_BANDS rows; candidates above ~0.7 similarity
+BLOCK_SHINGLES = 16384  # Shingles hashed at once, bounding memory to ~16 MB
+MIX_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+NON_WORD = re.compile(r"[^a-z0-9' ]+")
+
+_rng = np.random.RandomState(42)
+# Multiply-shift hash functions: odd 64-bit multipliers, top 32 bits kept
+PERMUTATION_A = _rng.randint(0, 1 << 63, size=(NUM_PERMUTATIONS, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+PERMUTATION_B = _rng.randint(0, 1 << 63, size=(NUM_PERMUTATIONS, 1), dtype=np.uint64)
+
+
+def shingle_text(sentence):
+    """Lowercase a sentence and drop punctuation, padded to at least one shingle"""
+    text = ' '.join(NON_WORD.sub(' ', sentence.lower()).split())
+    return text.ljust(SHINGLE_SIZE)
+
+
+def shingle_hashes(sentences):
+    """
+    Hash the character shingles of all sentences in one vectorized pass.
+
+    Returns:
+        tuple: (hashes, starts) where ``hashes`` holds 32-bit shingle
+        hashes grouped by sentence and sentence ``i`` owns
+        ``hashes[starts[i]:starts[i + 1]]``.
+    """
+    texts = [shingle_text(s).encode('utf-8') for s in sentences]
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    buffer = np.frombuffer(b''.join(texts), dtype=np.uint8).astype(np.uint64)
+
+    # Pack each 5-byte window into one 40-bit integer, then mix it down to 32 bits
+    packed = np.zeros(len(buffer) - SHINGLE_SIZE + 1, dtype=np.uint64)
+    for offset in range(SHINGLE_SIZE):
+        packed = (packed << np.uint64(8)) | buffer[offset:len(buffer) - SHINGLE_SIZE + 1 + offset]
+    mixed = (packed * MIX_MULTIPLIER) >> np.uint64(32)
+
+    # Keep only windows that lie within a single sentence
+    counts = lengths - SHINGLE_SIZE + 1
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    window_starts = np.repeat(offsets, counts) + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+    starts = np.concatenate(([0], np.cumsum(counts)))
+    return mixed[window_starts], starts
+
+
+def minhash_signatures(sentences):
+    """
+    MinHash signature of each sentence's shingle set.
+
+    Returns:
+        numpy.ndarray: (len(sentences), NUM_PERMUTATIONS) uint32 signatures.
+    """
+    hashes, starts = shingle_hashes(sentences)
+    signatures = np.empty((len(sentences), NUM_PERMUTATIONS), dtype=np.uint32)
+    first = 0
+    while first < len(sentences):
+        # Take whole sentences until the block is full
+        last = max(first + 1, int(np.searchsorted(starts, starts[first] + BLOCK_SHINGLES, side='right')) - 1)
+        last = min(last, len(sentences))
+        block = hashes[starts[first]:starts[last]]
+        permuted = np.multiply(PERMUTATION_A, block)
+        permuted += PERMUTATION_B
+        permuted >>= np.uint64(32)
+        signatures[first:last] = np.minimum.reduceat(permuted, starts[first:last] - starts[first], axis=1).T
+        first = last
+    return signatures
+
+
+def near_duplicates(sentences, threshold=DEDUP_THRESHOLD):
+    """
+    Find near-duplicate sentences with MinHash and locality-sensitive hashing.
+
+    Signatures are split into LSH_BANDS bands; sentences sharing any band
+    become candidates, and candidates whose signatures agree on at least
+    ``threshold`` of their rows are merged. Only candidate pairs are
+    compared, so the work grows about linearly with the number of
+    sentences.
+
+    Returns:
+        numpy.ndarray: For each sentence, the index of the earliest
+        sentence it duplicates (its own index when it is unique).
+    """
+    count = len(sentences)
+    if count < 2:
+        return np.arange(count)
+
+    signatures = minhash_signatures(sentences)
+    rows = NUM_PERMUTATIONS // LSH_BANDS
+    positions = np.arange(count)
+    pairs = []
+    for band in range(LSH_BANDS):
+        keys = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows]).view(
+            np.dtype((np.void, rows * 4))).ravel()
+        _, buckets = np.unique(keys, return_inverse=True)
+        order = np.argsort(buckets.ravel(), kind='stable')
+        # Pair every bucket member with the bucket's earliest sentence
+        repeat = np.concatenate(([False], buckets.ravel()[order][1:] == buckets.ravel()[order][:-1]))
+        heads = np.maximum.accumulate(np.where(repeat, 0, positions))
+        pairs.append(order[heads[repeat]] * count + order[repeat])
+    candidates = np.unique(np.concatenate(pairs))
+
+    # Keep candidates whose signatures agree on enough rows
+    first, second = candidates // count, candidates % count
+    similar = (signatures[first] == signatures[second]).mean(axis=1) >= threshold
+
+    parents = list(range(count))
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    for i, j in zip(first[similar].tolist(), second[similar].tolist()):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parents[max(root_i, root_j)] = min(root_i, root_j)
+    return np.array([find(i) for i in range(count)])
+
+
+def unique_sentences(sentences, threshold=DEDUP_THRESHOLD):
+    """Drop sentences that nearly repeat an earlier one, keeping document order"""
+    if not DEDUP_ENABLED or len(sentences) < 2:
+        return list(sentences)
+    representatives = near_duplicates(sentences, threshold)
+    return [s for i, s in enumerate(sentences) if representatives[i] == i]
+
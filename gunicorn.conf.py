@@ -0,0 +1,12 @@
+# gunicorn.conf.py
+import os
+
+# Import the app and run its warm-up once in the master process, so every
+# worker starts with the heavy modules and language resources already
+# loaded and shares their memory copy-on-write.
+preload_app = True
+
+# Job state lives in the worker process, so keep a single worker and
+# scale with threads instead.
+workers = int(os.environ.get('GUNICORN_WORKERS', 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
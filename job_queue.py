@@ -0,0 +1,234 @@
+import threading
+import time
+import uuid
+import heapq
+import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from metrics import JOB_QUEUE_SECONDS, JOB_PROCESSING_SECONDS
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+
+class Job:
+    """A unit of background work and the state clients poll for."""
+
+    def __init__(self, kind, cost=1.0, client=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.cost = cost
+        self.client = client
+        self.status = QUEUED
+        self.stage = 'Queued'
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.events = []
+        self.changed = threading.Condition()
+
+    def set_stage(self, stage, event='stage', **data):
+        """Progress callback handed to the processing chain
+
+        Every call is recorded as an event, so streaming clients can replay
+        stages and partial results (``data``) in order.
+        """
+        with self.changed:
+            self.stage = stage
+            self.events.append(dict(data, event=event, stage=stage))
+            self.changed.notify_all()
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+    @property
+    def queue_seconds(self):
+        """Time spent waiting for admission, so far if still queued"""
+        return (self.started_at or time.time()) - self.created_at
+
+    @property
+    def processing_seconds(self):
+        """Time spent processing after admission, so far if still running"""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def wait(self, timeout=None):
+        """Block until the job finishes; return whether it did"""
+        with self.changed:
+            return self.changed.wait_for(lambda: self.finished, timeout)
+
+    def wait_for_events(self, after, timeout):
+        """
+        Wait until there are events past index ``after`` or the job finishes.
+
+        Returns:
+            list: New (index, event) pairs, possibly empty on timeout.
+        """
+        with self.changed:
+            self.changed.wait_for(lambda: len(self.events) > after + 1 or self.finished, timeout)
+            return list(enumerate(self.events))[after + 1:]
+
+    def to_dict(self):
+        data = {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'stage': self.stage,
+            'cost': round(self.cost, 1),
+            'queue_seconds': round(self.queue_seconds, 3),
+            'processing_seconds': round(self.processing_seconds, 3),
+        }
+        if self.status == DONE:
+            data['result'] = self.result
+        elif self.status == FAILED:
+            data['error'] = self.error
+        return data
+
+
+class JobQueue:
+    """
+    Bounded, cost-aware scheduler and worker pool for the processing chain.
+
+    At most ``max_pending`` jobs may be queued or running; further
+    submissions raise QueueFullError so the caller can answer with HTTP
+    429. Finished jobs are kept for ``result_ttl`` seconds for polling.
+
+    Every job carries an estimated ``cost`` (audio-seconds of work). Jobs
+    are admitted while fewer than ``max_workers`` run and the cost in
+    flight stays within ``cost_budget``; a job costlier than the whole
+    budget still runs, alone. Queued jobs are ordered by weighted fair
+    queuing per client (self-clocked finish tags): each client's jobs are
+    stamped with its cumulative cost, so a client's short jobs are not
+    stuck behind another client's long ones, and no client can take more
+    than its share by submitting many jobs.
+
+    Job state lives in the worker process, so the app must be served by a
+    single process (use gunicorn threads rather than extra workers).
+    """
+
+    def __init__(self, max_workers=2, max_pending=8, result_ttl=3600, cost_budget=None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.cost_budget = cost_budget
+        self.cost_in_flight = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job-worker')
+        self._jobs = {}
+        self._pending = 0
+        self._running = 0
+        self._queue = []  # Heap of (finish_tag, sequence, job, call)
+        self._sequence = 0
+        self._virtual_time = 0.0
+        self._client_finish = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, func, *args, cost=1.0, client=None, weight=1.0, keep=True, **kwargs):
+        """
+        Queue ``func(*args, progress=job.set_stage, **kwargs)`` as a new job.
+
+        ``func`` runs in a copy of the caller's context, so per-request
+        stage timings still reach the caller. Jobs submitted with ``keep``
+        off are not registered for polling.
+
+        Args:
+            cost (float): Estimated work, in audio-seconds.
+            client (str): Client the job is scheduled fairly against.
+            weight (float): The client's share relative to others.
+
+        Returns:
+            Job: The queued job.
+
+        Raises:
+            QueueFullError: If ``max_pending`` jobs are already in flight.
+        """
+        job = Job(kind, cost=cost, client=client)
+        call = (func, args, kwargs, contextvars.copy_context())
+        with self._lock:
+            self._expire()
+            if self._pending >= self.max_pending:
+                raise QueueFullError('Server is busy, please try again shortly')
+            self._pending += 1
+            if keep:
+                self._jobs[job.id] = job
+            job.set_stage('Queued')
+            start_tag = max(self._virtual_time, self._client_finish.get(client, 0.0))
+            finish_tag = start_tag + max(cost, 0.0) / weight
+            self._client_finish[client] = finish_tag
+            self._sequence += 1
+            heapq.heappush(self._queue, (finish_tag, self._sequence, job, call))
+            self._dispatch()
+        return job
+
+    def _dispatch(self):
+        """Start queued jobs in fair order while workers and the cost budget allow (lock held)"""
+        while self._queue and self._running < self.max_workers:
+            finish_tag, _, job, call = self._queue[0]
+            if (self._running and self.cost_budget
+                    and self.cost_in_flight + job.cost > self.cost_budget):
+                break  # Wait for running work rather than let smaller jobs starve this one
+            heapq.heappop(self._queue)
+            self._virtual_time = finish_tag
+            self._running += 1
+            self.cost_in_flight += job.cost
+            self._executor.submit(self._run, job, *call)
+        if not self._queue:
+            # Every client is idle, so past usage no longer matters
+            self._client_finish.clear()
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    @property
+    def depth(self):
+        """Number of jobs queued or running"""
+        return self._pending
+
+    @property
+    def queued(self):
+        """Number of jobs waiting for admission"""
+        return len(self._queue)
+
+    def _run(self, job, func, args, kwargs, context):
+        job.status = RUNNING
+        job.started_at = time.time()
+        JOB_QUEUE_SECONDS.observe(job.queue_seconds, kind=job.kind)
+        try:
+            result = context.run(func, *args, progress=job.set_stage, **kwargs)
+            with job.changed:
+                job.result = result
+                job.status = DONE
+                job.stage = 'Completed'
+        except Exception as e:
+            logging.error(f"Job {job.id} failed: {e}")
+            with job.changed:
+                job.error = str(e)
+                job.status = FAILED
+                job.stage = 'Failed'
+        finally:
+            with job.changed:
+                job.finished_at = time.time()
+                job.changed.notify_all()
+            JOB_PROCESSING_SECONDS.observe(job.processing_seconds, kind=job.kind)
+            with self._lock:
+                self._pending -= 1
+                self._running -= 1
+                self.cost_in_flight -= job.cost
+                self._dispatch()
+
+    def _expire(self):
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
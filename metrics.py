@@ -0,0 +1,177 @@
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, _format_labels(self.labelnames, key), value)
+                    for key, value in sorted(self._values.items())]
+
+
+class Gauge:
+    """Value read from a callback at scrape time"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, func):
+        self.name = name
+        self.documentation = documentation
+        self.func = func
+
+    def samples(self):
+        return [(self.name, '', self.func())]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            series = self._series.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    labels = _format_labels(self.labelnames, key, ('le', repr(float(bound))))
+                    samples.append((f'{self.name}_bucket', labels, bucket_count))
+                samples.append((f'{self.name}_bucket', _format_labels(self.labelnames, key, ('le', '+Inf')), count))
+                samples.append((f'{self.name}_sum', _format_labels(self.labelnames, key), total))
+                samples.append((f'{self.name}_count', _format_labels(self.labelnames, key), count))
+        return samples
+
+
+class Registry:
+    """Collection of metrics rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'video_summarizer_stage_seconds', 'Time spent in each processing stage.', ['stage']))
+STAGE_ERRORS = REGISTRY.register(Counter(
+    'video_summarizer_stage_errors_total', 'Processing stages that raised an exception.', ['stage']))
+JOB_QUEUE_SECONDS = REGISTRY.register(Histogram(
+    'video_summarizer_job_queue_seconds', 'Time jobs waited for admission before processing.', ['kind']))
+JOB_PROCESSING_SECONDS = REGISTRY.register(Histogram(
+    'video_summarizer_job_processing_seconds', 'Time jobs spent processing after admission.', ['kind']))
+BYTES_PROCESSED = REGISTRY.register(Counter(
+    'video_summarizer_bytes_processed_total', 'Bytes handled by each kind of work.', ['kind']))
+TRANSLATION_RETRIES = REGISTRY.register(Counter(
+    'video_summarizer_translation_retries_total',
+    'Sentences retried individually after their batch failed to round-trip.'))
+TRANSLATION_FALLBACKS = REGISTRY.register(Counter(
+    'video_summarizer_translation_fallbacks_total',
+    'Translations that fell back to the original text.', ['reason']))
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    'video_summarizer_http_requests_total', 'HTTP requests by endpoint and status.', ['endpoint', 'status']))
+
+# Per-request stage timings, collected only while a request opts in
+_request_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+def start_request_timing():
+    """Begin collecting stage timings for the current request context"""
+    _request_timings.set([])
+
+
+def request_timings():
+    """Return the (stage, seconds) pairs collected for the current request"""
+    return _request_timings.get() or []
+
+
+def format_timing_header(timings):
+    """Format stage timings as ``stage;dur=milliseconds`` entries"""
+    return ', '.join(f'{stage};dur={seconds * 1000:.1f}' for stage, seconds in timings)
+
+
+def record_timing(stage, seconds):
+    """Add a duration measured elsewhere to the current request's stage timings"""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+@contextmanager
+def timer(stage):
+    """Time a block as one observation of a processing stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        record_timing(stage, elapsed)
+
+
+def timed(stage, func, *args, **kwargs):
+    """Call ``func`` under a stage timer and return its result"""
+    with timer(stage):
+        return func(*args, **kwargs)
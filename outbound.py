@@ -0,0 +1,254 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from metrics import REGISTRY, Counter
+
+# Hedging settings
+OUTBOUND_HEDGING = os.environ.get('OUTBOUND_HEDGING', 'true').lower() not in ('0', 'false', 'no')
+HEDGE_PERCENTILE = float(os.environ.get('HEDGE_PERCENTILE', 95))  # Hedge calls slower than this
+HEDGE_MIN_SAMPLES = 20      # Latencies observed before hedging starts
+HEDGE_MIN_DELAY = 0.05      # Never hedge sooner than this many seconds
+HEDGE_BUDGET = 0.1          # Hedges allowed per call, so a slow backend is not flooded
+LATENCY_WINDOW = 200        # Recent latencies the hedge delay is computed from
+OUTBOUND_MAX_WORKERS = 32   # Threads per service, including abandoned slow attempts
+
+# Circuit breaker settings
+BREAKER_FAILURES = int(os.environ.get('BREAKER_FAILURES', 5))  # Consecutive failures that open the circuit
+BREAKER_RESET_SECONDS = float(os.environ.get('BREAKER_RESET_SECONDS', 30))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+OUTBOUND_CALLS = REGISTRY.register(Counter(
+    'video_summarizer_outbound_calls_total',
+    'Calls to external services by outcome (ok, error, timeout, rejected).', ['service', 'outcome']))
+OUTBOUND_HEDGES = REGISTRY.register(Counter(
+    'video_summarizer_outbound_hedges_total',
+    'Hedged duplicate requests sent, and how many answered first.', ['service', 'outcome']))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose circuit is open"""
+
+
+class DeadlineExceeded(Exception):
+    """Raised when no attempt of a call answered within its deadline"""
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a service keeps failing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected for ``reset_timeout`` seconds. Then a single trial
+    call is let through: success closes the circuit again, failure keeps
+    it open for another ``reset_timeout``.
+    """
+
+    def __init__(self, failure_threshold=BREAKER_FAILURES, reset_timeout=BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Return whether a call may be made now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN  # This caller makes the trial call
+                return True
+            return False
+
+    @property
+    def is_open(self):
+        """Whether calls are currently being rejected"""
+        with self._lock:
+            return self.state == HALF_OPEN or (
+                self.state == OPEN and time.monotonic() - self.opened_at < self.reset_timeout)
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logging.info("🔌 Circuit closed")
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                if self.state == CLOSED:
+                    logging.warning(f"⚡ Circuit opened after {self.failures} consecutive failures")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def percentile(self, percent):
+        with self._lock:
+            samples = sorted(self.samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * percent / 100.0))]
+
+
+_services = {}
+
+
+class OutboundService:
+    """
+    Deadlines, hedged requests and a circuit breaker for one external service.
+
+    Every call must answer within ``deadline`` seconds. If it has not
+    answered after the service's recent p95 latency (``hedge_percentile``),
+    one duplicate request is sent and whichever answers first wins; hedges
+    are capped at ``hedge_budget`` per call. Failed and timed-out calls
+    feed the circuit breaker, which rejects calls outright while the
+    service is degraded.
+
+    Exceptions listed in ``expected_exceptions`` are normal answers (such
+    as "no speech in this chunk") and count as successes.
+    """
+
+    def __init__(self, name, deadline, hedging=OUTBOUND_HEDGING, hedge_percentile=HEDGE_PERCENTILE,
+                 hedge_budget=HEDGE_BUDGET, breaker=None, expected_exceptions=(),
+                 max_workers=OUTBOUND_MAX_WORKERS):
+        self.name = name
+        self.deadline = deadline
+        self.hedging = hedging
+        self.hedge_percentile = hedge_percentile
+        self.hedge_budget = hedge_budget
+        self.breaker = breaker or CircuitBreaker()
+        self.expected_exceptions = tuple(expected_exceptions)
+        self.latencies = LatencyTracker()
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'outbound-{name}')
+        _services[name] = self
+
+    def hedge_delay(self):
+        """Seconds to wait before hedging a call, or None while hedging is off"""
+        if not self.hedging or len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return min(self.deadline, max(HEDGE_MIN_DELAY, self.latencies.percentile(self.hedge_percentile)))
+
+    def _spend_hedge(self):
+        with self._lock:
+            if self.hedges < self.hedge_budget * self.calls:
+                self.hedges += 1
+                return True
+            return False
+
+    def _attempt(self, func, args, kwargs):
+        """Run one attempt, returning (seconds, result, exception)"""
+        start = time.monotonic()
+        try:
+            return time.monotonic() - start, func(*args, **kwargs), None
+        except self.expected_exceptions as e:
+            return time.monotonic() - start, None, e
+        except Exception as e:
+            return None, None, e
+
+    def call(self, func, *args, **kwargs):
+        """
+        Call ``func(*args, **kwargs)`` under the deadline, hedging and circuit breaker.
+
+        Attempts that lose a hedge or miss the deadline are abandoned, not
+        interrupted, so ``func`` should enforce its own timeout as well.
+
+        Raises:
+            CircuitOpenError: If the circuit is open; no request was sent.
+            DeadlineExceeded: If no attempt answered within the deadline.
+            Exception: Whatever the last failed attempt raised.
+        """
+        if not self.breaker.allow():
+            OUTBOUND_CALLS.inc(service=self.name, outcome='rejected')
+            raise CircuitOpenError(f"The {self.name} service is unavailable")
+        with self._lock:
+            self.calls += 1
+
+        start = time.monotonic()
+        deadline_at = start + self.deadline
+        hedge_delay = self.hedge_delay()
+        hedge_at = start + hedge_delay if hedge_delay is not None else None
+
+        primary = self._executor.submit(self._attempt, func, args, kwargs)
+        pending = {primary}
+        error = None
+        while pending:
+            wait_until = min(deadline_at, hedge_at) if hedge_at is not None else deadline_at
+            done, pending = wait(pending, timeout=max(0, wait_until - time.monotonic()),
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                seconds, result, error = future.result()
+                if seconds is None:
+                    continue  # Failed; keep waiting for any other attempt
+                self.latencies.add(seconds)
+                self.breaker.record_success()
+                OUTBOUND_CALLS.inc(service=self.name, outcome='ok')
+                if future is not primary:
+                    with self._lock:
+                        self.hedge_wins += 1
+                    OUTBOUND_HEDGES.inc(service=self.name, outcome='won')
+                if error is not None:
+                    raise error
+                return result
+
+            if not pending:
+                break
+            if time.monotonic() >= deadline_at:
+                self.breaker.record_failure()
+                OUTBOUND_CALLS.inc(service=self.name, outcome='timeout')
+                raise DeadlineExceeded(f"The {self.name} service did not answer within {self.deadline:g}s")
+            if hedge_at is not None and time.monotonic() >= hedge_at:
+                hedge_at = None  # One hedge per call at most
+                if self._spend_hedge():
+                    OUTBOUND_HEDGES.inc(service=self.name, outcome='sent')
+                    pending.add(self._executor.submit(self._attempt, func, args, kwargs))
+
+        self.breaker.record_failure()
+        OUTBOUND_CALLS.inc(service=self.name, outcome='error')
+        raise error
+
+    def stats(self):
+        delay = self.hedge_delay()
+        p50, p95 = self.latencies.percentile(50), self.latencies.percentile(95)
+        with self._lock:
+            return {
+                'circuit': OPEN if self.breaker.is_open else CLOSED,
+                'calls': self.calls,
+                'hedges': self.hedges,
+                'hedge_wins': self.hedge_wins,
+                'latency_p50': round(p50, 4) if p50 is not None else None,
+                'latency_p95': round(p95, 4) if p95 is not None else None,
+                'hedge_delay': round(delay, 4) if delay is not None else None,
+                'deadline': self.deadline,
+            }
+
+
+def services():
+    """Return the outbound services created so far, by name"""
+    return dict(_services)
@@ -0,0 +1,205 @@
+import os
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+
+# Namespaces for the separately cached pipeline layers
+SEGMENTS = 'segments'
+SUMMARY = 'summary'
+TRANSLATION = 'translation'
+
+
+def hash_bytes(data):
+    """Return the hex SHA-256 digest of a str or bytes value"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+class MemoryBackend:
+    """In-process LRU store bounded by the total size of its values."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= len(old)
+            self._entries[key] = value
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskBackend:
+    """One file per entry under a directory, evicting least recently used files."""
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.current_bytes = sum(size for _, _, size in self._scan())
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _scan(self):
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = f.read()
+            os.utime(path)  # Mark as recently used
+            return value
+        except OSError:
+            return None
+
+    def set(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                old_size = os.path.getsize(path) if os.path.exists(path) else 0
+                with open(tmp_path, 'wb') as f:
+                    f.write(value)
+                os.replace(tmp_path, path)
+                self.current_bytes += len(value) - old_size
+            except OSError as e:
+                logging.warning(f"Result cache write failed for {key}: {e}")
+                return
+            if self.current_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = sorted(self._scan())
+        self.current_bytes = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if self.current_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self.current_bytes -= size
+            except OSError:
+                pass
+
+
+class ResultCache:
+    """
+    Content-addressed cache for pipeline results.
+
+    Each layer (transcript, summary, translation) lives in its own
+    namespace so that a repeat upload only recomputes the layers that are
+    missing. Entries are kept in a size-bounded in-memory LRU, optionally
+    backed by a size-bounded directory on disk.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, cache_dir=None, disk_max_bytes=None):
+        self.memory = MemoryBackend(max_bytes)
+        self.disk = None
+        if cache_dir:
+            self.disk = DiskBackend(cache_dir, disk_max_bytes or max_bytes * 8)
+        self._lock = threading.Lock()
+        self.hits = {}
+        self.misses = {}
+
+    @staticmethod
+    def make_key(namespace, *parts):
+        return hash_bytes('\x1f'.join((namespace,) + tuple(str(p) for p in parts)))
+
+    def _count(self, counter, namespace):
+        with self._lock:
+            counter[namespace] = counter.get(namespace, 0) + 1
+
+    def get(self, namespace, *parts):
+        """Return the cached string for the key parts, or None"""
+        key = self.make_key(namespace, *parts)
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        if value is None:
+            self._count(self.misses, namespace)
+            return None
+        self._count(self.hits, namespace)
+        return value.decode('utf-8')
+
+    def set(self, namespace, *parts, value):
+        key = self.make_key(namespace, *parts)
+        data = value.encode('utf-8')
+        self.memory.set(key, data)
+        if self.disk is not None:
+            self.disk.set(key, data)
+
+    def get_or_compute(self, namespace, *parts, compute, should_cache=None):
+        """
+        Return a cached result, computing and storing it on a miss.
+
+        Args:
+            namespace (str): Cache layer the result belongs to.
+            *parts: Values identifying the result within the layer.
+            compute (callable): Produces the result on a miss.
+            should_cache (callable): Optional predicate deciding whether a
+                freshly computed result may be stored.
+        """
+        value = self.get(namespace, *parts)
+        if value is not None:
+            return value
+        value = compute()
+        if value and (should_cache is None or should_cache(value)):
+            self.set(namespace, *parts, value=value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            hits = dict(self.hits)
+            misses = dict(self.misses)
+        total_hits = sum(hits.values())
+        total = total_hits + sum(misses.values())
+        stats = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(total_hits / total, 4) if total else 0.0,
+            'memory_entries': len(self.memory),
+            'memory_bytes': self.memory.current_bytes,
+            'memory_max_bytes': self.memory.max_bytes,
+        }
+        if self.disk is not None:
+            stats['disk_bytes'] = self.disk.current_bytes
+            stats['disk_max_bytes'] = self.disk.max_bytes
+        return stats
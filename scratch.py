@@ -0,0 +1,226 @@
+import os
+import time
+import uuid
+import shutil
+import logging
+import threading
+
+# RAM-backed scratch space (tmpfs); empty to keep everything on disk
+SCRATCH_RAM_DIR = os.environ.get('SCRATCH_RAM_DIR', '/dev/shm' if os.path.isdir('/dev/shm') else '')
+SCRATCH_RAM_BYTES = int(os.environ.get('SCRATCH_RAM_BYTES', 256 * 1024 * 1024))
+# Total scratch space reserved at once, RAM and disk together
+SCRATCH_QUOTA_BYTES = int(os.environ.get('SCRATCH_QUOTA_BYTES', 2 * 1024 * 1024 * 1024))
+SCRATCH_MIN_FREE_BYTES = 256 * 1024 * 1024  # Never fill a filesystem beyond this
+SCRATCH_MAX_AGE = int(os.environ.get('SCRATCH_MAX_AGE', 6 * 3600))  # Older entries are orphans
+SCRATCH_JANITOR_INTERVAL = 600  # Seconds between sweeps
+RAM_SUBDIR = 'video-summarizer-scratch'
+
+
+class ScratchFull(Exception):
+    """Raised when a reservation would exceed the quota or the free space"""
+
+
+class Reservation:
+    """Private scratch directory for one request, with room for ``size`` bytes"""
+
+    def __init__(self, space, directory, size, in_ram):
+        self.space = space
+        self.directory = directory
+        self.size = size
+        self.in_ram = in_ram
+        self.released = False
+
+    def path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def release(self):
+        """Delete the directory and everything in it, and return its space"""
+        self.space.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class ScratchSpace:
+    """
+    Quota-managed scratch space for uploads and intermediate files.
+
+    Each reservation is a fresh directory. It goes on tmpfs (``ram_dir``)
+    while the reserved RAM stays within ``ram_bytes`` and the filesystem
+    has room, and on ``disk_dir`` otherwise. Reservations across all
+    concurrent requests are capped at ``quota_bytes``, and no reservation
+    may leave less than SCRATCH_MIN_FREE_BYTES free on its filesystem, so
+    a burst of uploads is refused instead of filling the disk.
+
+    Directories left behind by killed workers are removed by ``sweep``
+    once they are older than ``max_age`` seconds.
+    """
+
+    def __init__(self, disk_dir, ram_dir=SCRATCH_RAM_DIR, ram_bytes=SCRATCH_RAM_BYTES,
+                 quota_bytes=SCRATCH_QUOTA_BYTES, max_age=SCRATCH_MAX_AGE):
+        self.disk_dir = disk_dir
+        self.ram_dir = os.path.join(ram_dir, RAM_SUBDIR) if ram_dir and ram_bytes > 0 else None
+        self.ram_bytes = ram_bytes
+        self.quota_bytes = quota_bytes
+        self.max_age = max_age
+        self.reserved = {'ram': 0, 'disk': 0}
+        self.live = {}
+        self.reclaimed = 0
+        self._lock = threading.Lock()
+        self._janitor_pid = None
+        # A fork (gunicorn preload) can happen while the janitor holds the lock
+        os.register_at_fork(after_in_child=self._reset_lock)
+
+    def _reset_lock(self):
+        self._lock = threading.Lock()
+
+    @property
+    def roots(self):
+        return [root for root in (self.ram_dir, self.disk_dir) if root]
+
+    def _has_room(self, root, size):
+        try:
+            os.makedirs(root, exist_ok=True)
+            return shutil.disk_usage(root).free - size >= SCRATCH_MIN_FREE_BYTES
+        except OSError:
+            return False
+
+    def reserve(self, size):
+        """
+        Reserve ``size`` bytes and create a directory for them.
+
+        Returns:
+            Reservation: The reservation; release it when done.
+
+        Raises:
+            ScratchFull: If the quota or the free disk space would be exceeded.
+        """
+        with self._lock:
+            if self.reserved['ram'] + self.reserved['disk'] + size > self.quota_bytes:
+                raise ScratchFull('Server is busy, please try again shortly')
+            in_ram = (self.ram_dir is not None and self.reserved['ram'] + size <= self.ram_bytes
+                      and self._has_room(self.ram_dir, size))
+            if not in_ram and not self._has_room(self.disk_dir, size):
+                raise ScratchFull('Server is out of storage space, please try again shortly')
+            self.reserved['ram' if in_ram else 'disk'] += size
+
+        root = self.ram_dir if in_ram else self.disk_dir
+        directory = os.path.join(root, f"{os.getpid()}-{uuid.uuid4().hex}")
+        reservation = Reservation(self, directory, size, in_ram)
+        try:
+            os.makedirs(directory)
+        except OSError:
+            self.release(reservation)
+            raise
+        with self._lock:
+            self.live[directory] = reservation
+        return reservation
+
+    def release(self, reservation):
+        with self._lock:
+            if reservation.released:
+                return
+            reservation.released = True
+            self.reserved['ram' if reservation.in_ram else 'disk'] -= reservation.size
+            self.live.pop(reservation.directory, None)
+        shutil.rmtree(reservation.directory, ignore_errors=True)
+
+    def _last_modified(self, path):
+        """Newest modification time of an entry or, for a directory, of anything directly in it"""
+        newest = os.path.getmtime(path)
+        if os.path.isdir(path):
+            for entry in os.scandir(path):
+                try:
+                    newest = max(newest, entry.stat(follow_symlinks=False).st_mtime)
+                except OSError:
+                    pass
+        return newest
+
+    def sweep(self, max_age=None):
+        """
+        Remove entries older than ``max_age`` seconds from every scratch root.
+
+        Reservations still held by this process are never touched.
+
+        Returns:
+            int: Bytes reclaimed.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        cutoff = time.time() - max_age
+        reclaimed = 0
+        for root in self.roots:
+            if not os.path.isdir(root):
+                continue
+            for entry in os.scandir(root):
+                with self._lock:
+                    if entry.path in self.live:
+                        continue
+                try:
+                    if self._last_modified(entry.path) > cutoff:
+                        continue
+                    size = disk_usage(entry.path)
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.remove(entry.path)
+                    reclaimed += size
+                except OSError as e:
+                    logging.warning(f"⚠️ Could not reclaim {entry.path}: {e}")
+        if reclaimed:
+            logging.info(f"🧹 Reclaimed {reclaimed / (1024 * 1024):.1f} MB of orphaned scratch files")
+        with self._lock:
+            self.reclaimed += reclaimed
+        return reclaimed
+
+    def start_janitor(self, interval=SCRATCH_JANITOR_INTERVAL):
+        """Sweep now and then every ``interval`` seconds on a daemon thread
+
+        With gunicorn's ``preload_app`` the janitor runs in the master
+        process and keeps sweeping for all workers. Calling this again in
+        a process that already has a janitor does nothing.
+        """
+        with self._lock:
+            if self._janitor_pid == os.getpid():
+                return
+            self._janitor_pid = os.getpid()
+        self.sweep()
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.sweep()
+                except Exception as e:
+                    logging.error(f"Scratch janitor error: {e}")
+
+        threading.Thread(target=run, name='scratch-janitor', daemon=True).start()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'ram_dir': self.ram_dir,
+                'disk_dir': self.disk_dir,
+                'ram_reserved_bytes': self.reserved['ram'],
+                'ram_max_bytes': self.ram_bytes if self.ram_dir else 0,
+                'disk_reserved_bytes': self.reserved['disk'],
+                'quota_bytes': self.quota_bytes,
+                'reservations': len(self.live),
+                'reclaimed_bytes': self.reclaimed,
+            }
+
+
+def disk_usage(path):
+    """Total size of a file, or of all files under a directory"""
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
@@ -9,8 +9,9 @@ document.getElementById('videoFile').addEventListener('change', function(e) {
 
 function validateAndSetFile(file) {
     // Check file type
-    if (!file.type.includes('mp4')) {
-        alert('Please upload only MP4 files');
+    const extension = file.name.split('.').pop().toLowerCase();
+    if (!['mp4', 'mp3', 'm4a', 'wav', 'ogg'].includes(extension)) {
+        alert('Please upload an MP4 video or an MP3, M4A, WAV or OGG audio file');
         return;
     }
 
@@ -39,44 +40,195 @@ function validateAndSetFile(file) {
 
 function processVideo(action) {
     if (!currentFile) {
-        alert('Please select a video file first');
+        alert('Please select a file first');
         return;
     }
 
-    const language = document.getElementById('language').value;
+    const languages = Array.from(document.getElementById('language').selectedOptions, option => option.value);
+    if (!languages.length) {
+        alert('Please select at least one output language');
+        return;
+    }
+    // Form fields go before the video so the server can validate them
+    // while the upload is still streaming in
     const formData = new FormData();
-    formData.append('video', currentFile);
-    formData.append('language', language);
+    formData.append('language', languages.join(','));
     formData.append('action', action);
+    formData.append('video', currentFile);
 
     // Show loading
     document.getElementById('loading').style.display = 'block';
+    document.getElementById('loadingStage').textContent = 'Uploading file...';
     document.getElementById('resultsSection').style.display = 'none';
 
-    fetch(`/${action}`, {
+    fetch('/jobs', {
         method: 'POST',
         body: formData
     })
     .then(response => response.json())
     .then(data => {
-        document.getElementById('loading').style.display = 'none';
-        
         if (data.success) {
-            displayResults(data, action);
+            streamJob(data.job_id, action);
         } else {
+            document.getElementById('loading').style.display = 'none';
             alert('Error: ' + data.error);
         }
     })
     .catch(error => {
         document.getElementById('loading').style.display = 'none';
         console.error('Error:', error);
-        alert('An error occurred while processing the video');
+        alert('An error occurred while processing the file');
+    });
+}
+
+const JOB_POLL_INTERVAL = 2000;
+
+function finishJob(job, action) {
+    document.getElementById('loading').style.display = 'none';
+    document.getElementById('partialResults').style.display = 'none';
+
+    if (job.status === 'done') {
+        if (job.result.success) {
+            displayResults(job.result, action, job.job_id);
+        } else {
+            alert('Error: ' + job.result.error);
+        }
+    } else {
+        alert('Error: ' + job.error);
+    }
+}
+
+function streamJob(jobId, action) {
+    // Fall back to polling where Server-Sent Events are unavailable
+    if (!window.EventSource) {
+        pollJob(jobId, action);
+        return;
+    }
+
+    const partial = document.getElementById('partialResults');
+    const sections = { transcript: '', summary: '', translations: {} };
+    partial.textContent = '';
+    partial.style.display = 'none';
+
+    function renderPartial() {
+        const parts = [];
+        if (sections.transcript) parts.push(`English: ${sections.transcript}`);
+        if (sections.summary) parts.push(`Summary: ${sections.summary}`);
+        Object.entries(sections.translations).forEach(([language, text]) => {
+            if (text) parts.push(`Translation (${language}): ${text}`);
+        });
+        partial.textContent = parts.join('\n\n');
+        partial.style.display = parts.length ? 'block' : 'none';
+    }
+
+    const source = new EventSource(`/jobs/${jobId}/events`);
+    let finished = false;
+
+    source.addEventListener('stage', e => {
+        document.getElementById('loadingStage').textContent = `${JSON.parse(e.data).stage}...`;
+    });
+    source.addEventListener('transcript', e => {
+        const data = JSON.parse(e.data);
+        sections.transcript = [sections.transcript, data.text].filter(Boolean).join(' ');
+        document.getElementById('loadingStage').textContent = `Transcribing audio (${data.index + 1}/${data.total})...`;
+        renderPartial();
+    });
+    source.addEventListener('summary', e => {
+        sections.summary = JSON.parse(e.data).text;
+        renderPartial();
+    });
+    source.addEventListener('translation', e => {
+        const data = JSON.parse(e.data);
+        const previous = sections.translations[data.language] || '';
+        sections.translations[data.language] = [previous, data.text].filter(Boolean).join(' ');
+        document.getElementById('loadingStage').textContent = `Translating (${data.index}/${data.total} sentences)...`;
+        renderPartial();
+    });
+    source.addEventListener('translated', e => {
+        // A language finished; its full text replaces the streamed pieces
+        const data = JSON.parse(e.data);
+        if (data.success) sections.translations[data.language] = data.text;
+        renderPartial();
     });
+    ['done', 'failed'].forEach(name => source.addEventListener(name, e => {
+        finished = true;
+        source.close();
+        finishJob(JSON.parse(e.data), action);
+    }));
+    source.onerror = () => {
+        if (finished) return;
+        // Connection dropped mid-job: continue by polling instead
+        source.close();
+        pollJob(jobId, action);
+    };
 }
 
-function displayResults(data, action) {
+function pollJob(jobId, action) {
+    fetch(`/jobs/${jobId}`)
+    .then(response => response.json())
+    .then(job => {
+        if (!job.success) {
+            document.getElementById('loading').style.display = 'none';
+            alert('Error: ' + job.error);
+            return;
+        }
+
+        document.getElementById('loadingStage').textContent = `${job.stage}...`;
+
+        if (job.status === 'done' || job.status === 'failed') {
+            finishJob(job, action);
+        } else {
+            setTimeout(() => pollJob(jobId, action), JOB_POLL_INTERVAL);
+        }
+    })
+    .catch(error => {
+        document.getElementById('loading').style.display = 'none';
+        console.error('Error:', error);
+        alert('An error occurred while processing the file');
+    });
+}
+
+function exportLinks(jobId, track, label) {
+    const links = ['srt', 'vtt', 'json'].map(fmt =>
+        `<a href="/jobs/${jobId}/export.${fmt}?track=${track}" download>${fmt.toUpperCase()}</a>`);
+    return `<small>${label}: ${links.join(' | ')}</small>`;
+}
+
+function resultTranslations(data, action) {
+    // Results from before multi-language requests carry a single translation
+    if (data.translations) {
+        return data.target_languages.map(code => Object.assign({ code }, data.translations[code]));
+    }
+    const isTranscribe = action === 'transcribe';
+    return [{
+        language: data.language,
+        text: isTranscribe ? data.transcription_target : data.summary_target,
+        segments: (isTranscribe ? data.segments_target : data.summary_segments_target) || []
+    }];
+}
+
+function displayResults(data, action, jobId) {
     const resultContent = document.getElementById('resultContent');
     const downloadBtn = document.getElementById('downloadBtn');
+    const translations = resultTranslations(data, action);
+    const englishTrack = action === 'transcribe' ? 'english' : 'summary';
+    const targetTrack = action === 'transcribe' ? 'target' : 'summary_target';
+    const targetExports = translations
+        .filter(t => t.segments.length)
+        .map(t => '<br>' + exportLinks(jobId, t.code ? `${targetTrack}&language=${t.code}` : targetTrack,
+            `${t.language} subtitles`))
+        .join('');
+    const exports = jobId ? `
+                <div class="stats">
+                    ${exportLinks(jobId, englishTrack, 'English subtitles')}
+                    ${targetExports}
+                </div>` : '';
+    const suffix = action === 'transcribe' ? '' : ' Summary';
+    const targetSections = translations.map(t => `
+                <div class="language-section">
+                    <h5>${t.language}${suffix}:</h5>
+                    <div class="text-content">${t.error ? `<em>${t.error}</em>` : t.text}</div>
+                </div>`).join('');
     
     if (action === 'transcribe') {
         resultContent.innerHTML = `
@@ -86,13 +238,10 @@ function displayResults(data, action) {
                     <h5>English (Original):</h5>
                     <div class="text-content">${data.transcription_english}</div>
                 </div>
-                <div class="language-section">
-                    <h5>${data.language}:</h5>
-                    <div class="text-content">${data.transcription_target}</div>
-                </div>
+                ${targetSections}
                 <div class="stats">
                     <small>Original: ${data.original_length} characters | Translated: ${data.translated_length} characters</small>
-                </div>
+                </div>${exports}
             </div>
         `;
     } else {
@@ -103,24 +252,24 @@ function displayResults(data, action) {
                     <h5>English Summary:</h5>
                     <div class="text-content">${data.summary_english}</div>
                 </div>
-                <div class="language-section">
-                    <h5>${data.language} Summary:</h5>
-                    <div class="text-content">${data.summary_target}</div>
-                </div>
+                ${targetSections}
                 <div class="stats">
                     <small>Original text: ${data.original_text_length} characters | Summary: ${data.summary_length} characters</small>
-                </div>
+                </div>${exports}
             </div>
         `;
     }
     
     // Store data for download
-    const content = action === 'transcribe' ? 
-        `ENGLISH TRANSCRIPTION:\n${data.transcription_english}\n\n${data.language.toUpperCase()} TRANSCRIPTION:\n${data.transcription_target}\n\nGenerated by Video Summarizer Tool` :
-        `ENGLISH SUMMARY:\n${data.summary_english}\n\n${data.language.toUpperCase()} SUMMARY:\n${data.summary_target}\n\nGenerated by Video Summarizer Tool`;
+    const heading = action === 'transcribe' ? 'TRANSCRIPTION' : 'SUMMARY';
+    const english = action === 'transcribe' ? data.transcription_english : data.summary_english;
+    const content = [`ENGLISH ${heading}:\n${english}`]
+        .concat(translations.map(t => `${t.language.toUpperCase()} ${heading}:\n${t.text}`))
+        .concat(['Generated by Video Summarizer Tool'])
+        .join('\n\n');
     
     downloadBtn.setAttribute('data-content', content);
-    downloadBtn.setAttribute('data-filename', `${action}_results_${data.language}.txt`);
+    downloadBtn.setAttribute('data-filename', `${action}_results_${translations.map(t => t.language).join('_')}.txt`);
     downloadBtn.style.display = 'block';
     
     document.getElementById('resultsSection').style.display = 'block';
@@ -0,0 +1,146 @@
+import numpy as np
+from scipy import sparse
+from text_pipeline import split_sentences, WORD_PATTERN
+
+# Language resources are loaded once per process, on first use or by
+# load_resources() during warm-up, and shared by every call
+_stemmer = None
+_stop_words = None
+
+LSA_WEIGHT = 0.5
+DENSE_SVD_LIMIT = 64  # Below this size a dense SVD is cheaper than ARPACK
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_ITERATIONS = 50
+TEXTRANK_TOLERANCE = 1e-6
+
+_stem_cache = {}
+
+
+def load_resources():
+    """Load the stemmer and stop words (importing sumy pulls in nltk)
+
+    Returns:
+        tuple: (stemmer, stop_words)
+    """
+    global _stemmer, _stop_words
+    if _stemmer is None:
+        from sumy.nlp.stemmers import Stemmer
+        from sumy.utils import get_stop_words
+        _stop_words = frozenset(get_stop_words("english"))
+        _stemmer = Stemmer("english")
+    return _stemmer, _stop_words
+
+
+def stem(word):
+    """Stem a word, memoizing results across calls"""
+    stemmed = _stem_cache.get(word)
+    if stemmed is None:
+        stemmed = load_resources()[0](word)
+        if len(_stem_cache) < 100000:
+            _stem_cache[word] = stemmed
+    return stemmed
+
+
+def build_tfidf_matrix(sentences):
+    """
+    Build an L2-normalized sentence x term TF-IDF matrix.
+
+    Each sentence is tokenized once; stop words are dropped and the
+    remaining words are stemmed into a shared vocabulary.
+
+    Returns:
+        scipy.sparse.csr_matrix: Matrix of shape (len(sentences), vocab_size).
+    """
+    stop_words = load_resources()[1]
+    vocabulary = {}
+    rows, cols = [], []
+    for row, sentence in enumerate(sentences):
+        for word in WORD_PATTERN.findall(sentence.lower()):
+            if word in stop_words:
+                continue
+            term = vocabulary.setdefault(stem(word), len(vocabulary))
+            rows.append(row)
+            cols.append(term)
+
+    shape = (len(sentences), max(1, len(vocabulary)))
+    counts = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float64), (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))),
+        shape=shape)
+    counts.sum_duplicates()
+
+    # Sublinear term frequency and smoothed inverse document frequency
+    counts.data = 1.0 + np.log(counts.data)
+    document_frequency = np.bincount(counts.indices, minlength=shape[1])
+    idf = np.log((1.0 + shape[0]) / (1.0 + document_frequency)) + 1.0
+    tfidf = counts.multiply(idf.reshape(1, -1)).tocsr()
+
+    norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms).dot(tfidf).tocsr()
+
+
+def lsa_scores(matrix, dimensions=3):
+    """Score sentences by their length in the truncated SVD topic space"""
+    n_sentences, n_terms = matrix.shape
+    k = min(dimensions, n_sentences - 1, n_terms - 1)
+    if k < 1:
+        return np.ones(n_sentences)
+    if min(n_sentences, n_terms) <= DENSE_SVD_LIMIT:
+        _, singular_values, vt = np.linalg.svd(matrix.T.toarray(), full_matrices=False)
+        singular_values, vt = singular_values[:k], vt[:k]
+    else:
+        from scipy.sparse.linalg import svds
+        _, singular_values, vt = svds(matrix.T, k=k)
+    return np.sqrt(((singular_values.reshape(-1, 1) * vt) ** 2).sum(axis=0))
+
+
+def textrank_scores(matrix):
+    """Score sentences with TextRank over the cosine similarity graph"""
+    n_sentences = matrix.shape[0]
+    similarity = matrix.dot(matrix.T).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+
+    out_weight = np.asarray(similarity.sum(axis=1)).ravel()
+    out_weight[out_weight == 0] = 1.0
+    transition = sparse.diags(1.0 / out_weight).dot(similarity).T.tocsr()
+
+    scores = np.full(n_sentences, 1.0 / n_sentences)
+    teleport = (1.0 - TEXTRANK_DAMPING) / n_sentences
+    for _ in range(TEXTRANK_ITERATIONS):
+        updated = teleport + TEXTRANK_DAMPING * transition.dot(scores)
+        if np.abs(updated - scores).sum() < TEXTRANK_TOLERANCE:
+            return updated
+        scores = updated
+    return scores
+
+
+def _normalize(scores):
+    top = scores.max() if len(scores) else 0
+    return scores / top if top > 0 else scores
+
+
+def rank_sentences(sentences):
+    """
+    Combine LSA and TextRank into one score per sentence.
+
+    Returns:
+        numpy.ndarray: Scores aligned with ``sentences``.
+    """
+    matrix = build_tfidf_matrix(sentences)
+    return LSA_WEIGHT * _normalize(lsa_scores(matrix)) + (1 - LSA_WEIGHT) * _normalize(textrank_scores(matrix))
+
+
+def summarize_sentences(sentences, sentence_count, min_words=0):
+    """
+    Pick the best ``sentence_count`` sentences, returned in document order.
+
+    Every sentence takes part in ranking, but only sentences with more
+    than ``min_words`` words can be selected.
+    """
+    eligible = np.array([len(s.split()) > min_words for s in sentences], dtype=bool)
+    if eligible.sum() <= sentence_count:
+        return [s for s, keep in zip(sentences, eligible) if keep]
+    scores = np.where(eligible, rank_sentences(sentences), -np.inf)
+    top = np.argsort(-scores, kind='stable')[:sentence_count]
+    return [sentences[i] for i in sorted(top)]
@@ -1,13 +1,28 @@
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lsa import LsaSummarizer
-from sumy.summarizers.text_rank import TextRankSummarizer
-from sumy.nlp.stemmers import Stemmer
-from sumy.utils import get_stop_words
-import re
-
-def hybrid_summarize_advanced(text, sentence_count=3):
-    """Create meaningful summary with proper text processing"""
+from summarization_engine import split_sentences, summarize_sentences
+from text_pipeline import clean_sentences
+from dedup import unique_sentences
+import os
+import math
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Hierarchical (map-reduce) summarization settings
+HIERARCHICAL_MIN_WORDS = 5000   # Longer transcripts are summarized window by window
+WINDOW_WORDS = 2000             # Approximate size of each map window
+MIN_SUMMARY_SENTENCES = 3
+MAX_SUMMARY_SENTENCES = 15
+SUMMARY_WORKERS = int(os.environ.get('SUMMARY_WORKERS', os.cpu_count() or 1))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def hybrid_summarize_advanced(text, sentence_count=None):
+    """Create meaningful summary with proper text processing
+
+    ``sentence_count`` defaults to a length that grows with the input.
+    """
     try:
         if not text or len(str(text).strip()) == 0:
             return "No text available for summarization."
@@ -17,6 +32,8 @@ def hybrid_summarize_advanced(text, sentence_count=3):
         # Clean and preprocess text
         cleaned_text = preprocess_text(text)
         word_count = len(cleaned_text.split())
+        if sentence_count is None:
+            sentence_count = scaled_sentence_count(word_count)
         
         print(f"📝 Generating summary from {word_count} words...")
         
@@ -26,7 +43,10 @@ def hybrid_summarize_advanced(text, sentence_count=3):
             
         # Try advanced summarization
         try:
-            summary = advanced_summarize(cleaned_text, sentence_count)
+            if word_count >= HIERARCHICAL_MIN_WORDS:
+                summary = hierarchical_summarize(cleaned_text, sentence_count)
+            else:
+                summary = advanced_summarize(cleaned_text, sentence_count)
             if summary and is_valid_summary(summary, cleaned_text):
                 return summary
         except Exception as e:
@@ -41,48 +61,21 @@ def hybrid_summarize_advanced(text, sentence_count=3):
 
 def preprocess_text(text):
     """Clean and prepare text for summarization"""
-    # Fix common speech recognition errors
-    text = re.sub(r'\bi\b', 'I', text)  # Fix 'i' to 'I'
-    text = re.sub(r" i'm ", " I'm ", text)
-    text = re.sub(r" i've ", " I've ", text)
-    text = re.sub(r" i'll ", " I'll ", text)
-    text = re.sub(r" i'd ", " I'd ", text)
-    
-    # Remove extra whitespace
-    text = ' '.join(text.split())
-    
-    # Ensure proper sentence structure
-    sentences = text.split('. ')
-    cleaned_sentences = []
-    
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if sentence:
-            # Capitalize first letter
-            if sentence and sentence[0].islower():
-                sentence = sentence[0].upper() + sentence[1:]
-            # Ensure sentence ends with period
-            if not sentence.endswith('.'):
-                sentence += '.'
-            cleaned_sentences.append(sentence)
-    
-    return ' '.join(cleaned_sentences)
+    # Fix common speech recognition errors, collapse whitespace and make
+    # sure every sentence is capitalized and punctuated, in one pass, then
+    # drop sentences that nearly repeat an earlier one
+    return ' '.join(unique_sentences(clean_sentences(text)))
 
 def advanced_summarize(text, sentence_count=3):
-    """Use LSA for extractive summarization"""
+    """Use vectorized LSA and TextRank for extractive summarization"""
     try:
-        parser = PlaintextParser.from_string(text, Tokenizer("english"))
-        stemmer = Stemmer("english")
-        
-        # Use LSA summarizer
-        summarizer = LsaSummarizer(stemmer)
-        summarizer.stop_words = get_stop_words("english")
+        sentences = split_sentences(text)
         
         # Get summary sentences
         summary_sentences = []
-        for sentence in summarizer(parser.document, sentence_count + 2):
-            sentence_text = str(sentence).strip()
-            if sentence_text and len(sentence_text.split()) > 3:
+        for sentence in summarize_sentences(sentences, sentence_count, min_words=3):
+            sentence_text = sentence.strip().rstrip('.')
+            if sentence_text:
                 summary_sentences.append(sentence_text)
         
         if summary_sentences:
@@ -102,6 +95,84 @@ def advanced_summarize(text, sentence_count=3):
         print(f"LSA summarization error: {e}")
         return None
 
+def scaled_sentence_count(word_count):
+    """Summary length growing with the square root of the input length"""
+    count = int(round(math.sqrt(word_count / 100.0)))
+    return max(MIN_SUMMARY_SENTENCES, min(MAX_SUMMARY_SENTENCES, count))
+
+def make_windows(sentences, window_words=WINDOW_WORDS):
+    """Group consecutive sentences into windows of about ``window_words`` words"""
+    windows, current, current_words = [], [], 0
+    for sentence in sentences:
+        words = len(sentence.split())
+        if current and current_words + words > window_words:
+            windows.append(current)
+            current, current_words = [], 0
+        current.append(sentence)
+        current_words += words
+    if current:
+        windows.append(current)
+    return windows
+
+def get_summary_pool():
+    """Return the shared process pool, or None when only one worker is configured"""
+    global _pool
+    if SUMMARY_WORKERS <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # Spawned workers avoid forking a multi-threaded server process
+            _pool = ProcessPoolExecutor(max_workers=SUMMARY_WORKERS,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+def summarize_windows(windows):
+    """Summarize each window, in parallel across the process pool when available"""
+    counts = [scaled_sentence_count(sum(len(s.split()) for s in window)) for window in windows]
+    pool = get_summary_pool() if len(windows) > 1 else None
+    if pool is not None:
+        try:
+            return list(pool.map(summarize_sentences, windows, counts, [3] * len(windows)))
+        except BrokenProcessPool as e:
+            global _pool
+            print(f"Summary worker pool failed, summarizing serially: {e}")
+            with _pool_lock:
+                _pool = None
+    return [summarize_sentences(window, count, 3) for window, count in zip(windows, counts)]
+
+def hierarchical_summarize(text, sentence_count=3):
+    """Map-reduce summarization for long transcripts
+
+    The transcript is split into windows that are summarized in parallel,
+    and the window summaries are reduced again until they are short
+    enough for a single pass. Each SVD only sees a bounded amount of text,
+    so memory stays bounded and work spreads across cores.
+    """
+    try:
+        sentences = split_sentences(text)
+        while sum(len(s.split()) for s in sentences) >= HIERARCHICAL_MIN_WORDS:
+            windows = make_windows(sentences)
+            if len(windows) <= 1:
+                break
+            reduced = [s for summary in summarize_windows(windows) for s in summary]
+            if len(reduced) >= len(sentences):
+                break
+            sentences = reduced
+
+        summary_sentences = [s.strip().rstrip('.') for s in summarize_sentences(sentences, sentence_count, min_words=3)]
+        summary_sentences = [s for s in summary_sentences if s]
+        if not summary_sentences:
+            return None
+
+        summary = '. '.join(summary_sentences)
+        if not summary.endswith('.'):
+            summary += '.'
+        return summary
+
+    except Exception as e:
+        print(f"Hierarchical summarization error: {e}")
+        return None
+
 def extract_key_sentences(text, sentence_count=2):
     """Extract important sentences for short texts"""
     sentences = text.split('. ')
@@ -152,14 +223,10 @@ def create_intelligent_summary(text, sentence_count=3):
             scored_sentences.append((score, sentence))
         
         # Sort by score and take top sentences
-        scored_sentences.sort(key=lambda x: x[0], reverse=True)
-        top_sentences = [s[1] for s in scored_sentences[:sentence_count]]
+        order = sorted(range(len(scored_sentences)), key=lambda i: scored_sentences[i][0], reverse=True)
         
         # Sort back to original order for coherence
-        top_sentences_sorted = []
-        for sentence in sentences:
-            if sentence in top_sentences:
-                top_sentences_sorted.append(sentence)
+        top_sentences_sorted = [sentences[i] for i in sorted(order[:sentence_count])]
         
         summary = '. '.join(top_sentences_sorted)
         if not summary.endswith('.'):
@@ -176,9 +243,9 @@ def is_valid_summary(summary, original_text):
     summary_words = set(summary.lower().split())
     original_words = set(original_text.lower().split())
     
-    # Summary should be at least 30% different from original
+    # Summary should cover less than 70% of the original vocabulary
     common_words = summary_words.intersection(original_words)
-    similarity = len(common_words) / len(summary_words) if summary_words else 0
+    similarity = len(common_words) / len(original_words) if original_words else 0
     
     return similarity < 0.7 and len(summary.split()) < len(original_text.split()) * 0.8
 
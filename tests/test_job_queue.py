@@ -0,0 +1,67 @@
+import threading
+import time
+
+from job_queue import JobQueue, QUEUED, DONE
+
+
+def blocking(gate, started=None):
+    """A job function that runs until ``gate`` is set"""
+    def run(progress=None):
+        if started is not None:
+            started.set()
+        assert gate.wait(5), 'the test never released the job'
+    return run
+
+
+def test_short_job_overtakes_another_clients_backlog():
+    queue = JobQueue(max_workers=1, max_pending=10)
+    gate = threading.Event()
+    order = []
+
+    def record(name, progress=None):
+        order.append(name)
+
+    first = queue.submit('test', blocking(gate), cost=100, client='a')
+    jobs = [queue.submit('test', record, f'a{index}', cost=100, client='a') for index in range(1, 4)]
+    jobs.append(queue.submit('test', record, 'b', cost=10, client='b'))
+    assert queue.queued == 4
+
+    gate.set()
+    for job in [first] + jobs:
+        assert job.wait(5)
+    assert order == ['b', 'a1', 'a2', 'a3']
+
+
+def test_job_over_the_remaining_budget_waits_for_released_cost():
+    queue = JobQueue(max_workers=2, max_pending=10, cost_budget=100)
+    gate = threading.Event()
+    started = threading.Event()
+
+    first = queue.submit('test', blocking(gate, started), cost=60)
+    second = queue.submit('test', lambda progress=None: 'ran', cost=60)
+    assert started.wait(5)
+    time.sleep(0.05)
+    # A worker is free, but 60 + 60 would exceed the budget of 100
+    assert second.status == QUEUED
+    assert queue.queued == 1
+    assert queue.cost_in_flight == 60
+
+    gate.set()
+    assert second.wait(5)
+    assert second.status == DONE and second.result == 'ran'
+    # The worker releases the job's cost just after waking waiters
+    deadline = time.monotonic() + 2
+    while queue.cost_in_flight and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert queue.cost_in_flight == 0
+
+
+def test_queue_wait_is_reported_apart_from_run_time():
+    queue = JobQueue(max_workers=1, max_pending=10)
+    queue.submit('test', lambda progress=None: time.sleep(0.3))
+    job = queue.submit('test', lambda progress=None: time.sleep(0.1))
+    assert job.wait(5)
+
+    data = job.to_dict()
+    assert 0.25 <= data['queue_seconds'] < 0.5
+    assert 0.08 <= data['processing_seconds'] < 0.25
@@ -0,0 +1,109 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import translation_service  # noqa: E402
+from stubs import TranslationStub  # noqa: E402
+from outbound import OutboundService, CircuitBreaker, CircuitOpenError, DeadlineExceeded  # noqa: E402
+from translation_memory import TranslationMemory  # noqa: E402
+from translation_service import HTTPBackend, TranslationEngine, translate_text  # noqa: E402
+
+
+@pytest.fixture
+def stub():
+    stub = TranslationStub(latency=0.01, jitter=0).start()
+    yield stub
+    stub.stop()
+
+
+def wait_for_requests(stub, count, timeout=2):
+    deadline = time.monotonic() + timeout
+    while stub.requests < count:
+        assert time.monotonic() < deadline, 'the stub never received the request'
+        time.sleep(0.005)
+
+
+def test_slow_call_raises_at_the_deadline(stub):
+    stub.latency = 0.5
+    service = OutboundService('test-deadline', deadline=0.1, hedging=False)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        service.call(HTTPBackend(stub.url).translate, 'Hello.', 'hi')
+    assert 0.1 <= time.monotonic() - start < 0.4
+
+
+def test_hedge_wins_against_a_slow_primary(stub):
+    backend = HTTPBackend(stub.url)
+    service = OutboundService('test-hedge', deadline=5, hedging=True, hedge_budget=1.0)
+    for _ in range(20):
+        service.call(backend.translate, 'Warm up.', 'hi')
+    hedge_delay = service.hedge_delay()
+    assert hedge_delay is not None
+
+    # Only the primary request is slow; the hedge sent after it is fast
+    stub.slow_rate, stub.slow_latency = 1.0, 1.0
+    before = stub.requests
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(service.call, backend.translate, 'Hedged.', 'hi')
+        wait_for_requests(stub, before + 1)
+        stub.slow_rate = 0.0
+        assert future.result() == '<hi>Hedged.'
+    elapsed = time.monotonic() - start
+
+    assert hedge_delay <= elapsed < stub.slow_latency
+    assert stub.requests == before + 2
+    assert service.hedge_wins == 1
+
+
+def test_open_breaker_falls_back_without_calling_the_backend(stub, monkeypatch):
+    stub.failure_rate = 1.0
+    service = OutboundService('test-breaker', deadline=1, hedging=False,
+                              breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60))
+    engine = TranslationEngine(HTTPBackend(stub.url), max_workers=1, rate=1000, burst=1000, max_batch_chars=1,
+                               outbound=service)
+    monkeypatch.setattr(translation_service, '_engine', engine)
+    monkeypatch.setattr(translation_service, '_memory', TranslationMemory(db_path=None))
+
+    text = 'One sentence. Two sentences. Three sentences. Four sentences. Five sentences.'
+    assert translate_text(text, 'hi').startswith('[Translation unavailable]')
+    assert service.breaker.is_open
+    assert stub.requests == 3
+
+    # With the circuit open nothing reaches the stub
+    assert translate_text('Six sentences.', 'hi') == '[Translation unavailable] Six sentences.'
+    assert stub.requests == 3
+
+
+def test_half_open_lets_exactly_one_trial_through(stub):
+    stub.failure_rate = 1.0
+    reset_timeout = 0.2
+    backend = HTTPBackend(stub.url)
+    service = OutboundService('test-half-open', deadline=2, hedging=False,
+                              breaker=CircuitBreaker(failure_threshold=1, reset_timeout=reset_timeout))
+    with pytest.raises(Exception):
+        service.call(backend.translate, 'Fails.', 'hi')
+    with pytest.raises(CircuitOpenError):
+        service.call(backend.translate, 'Rejected.', 'hi')
+
+    time.sleep(reset_timeout + 0.05)
+    stub.failure_rate, stub.latency = 0.0, 0.3
+    before = stub.requests
+
+    def call(index):
+        try:
+            return service.call(backend.translate, f'Trial {index}.', 'hi')
+        except CircuitOpenError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(call, range(5)))
+
+    assert stub.requests == before + 1
+    assert sum(result is not None for result in results) == 1
+    assert not service.breaker.is_open
@@ -0,0 +1,19 @@
+from text_pipeline import clean_sentences, split_sentences
+
+
+def test_decimals_stay_in_one_sentence():
+    assert clean_sentences("the loss fell to 3.5 percent. then it rose") == [
+        "The loss fell to 3.5 percent.", "Then it rose."]
+
+
+def test_abbreviations_are_not_split():
+    assert clean_sentences("we went to the u.s.") == ["We went to the u.s."]
+    assert split_sentences("Ask the U.S.A.") == ["Ask the U.S.A."]
+
+
+def test_domains_are_not_split():
+    assert clean_sentences("visit example.com for the slides") == ["Visit example.com for the slides."]
+
+
+def test_sentences_end_at_punctuation_before_whitespace():
+    assert split_sentences("Wait... what?! Okay") == ["Wait...", "what?!", "Okay"]
@@ -0,0 +1,60 @@
+import pytest
+
+import app
+import translation_service
+from outbound import OutboundService, CircuitBreaker
+from result_cache import ResultCache
+from translation_memory import TranslationMemory
+from translation_service import TranslationEngine
+
+SEGMENTS = [
+    {'start': 0.0, 'end': 2.0, 'text': 'The first sentence. The second sentence.'},
+    {'start': 2.0, 'end': 4.0, 'text': 'The third sentence.'},
+]
+
+
+class FlakyBackend:
+    """Fails requests containing any of ``failing`` until recovered, else echoes with a prefix"""
+
+    def __init__(self, *failing):
+        self.failing = failing
+
+    def translate(self, text, target_lang):
+        if any(word in text for word in self.failing):
+            raise ConnectionError('backend unavailable')
+        return '\n'.join(f"<{target_lang}>{line}" for line in text.split('\n'))
+
+
+@pytest.fixture
+def use_backend(monkeypatch):
+    def install(backend):
+        outbound = OutboundService(f'test-translation-{id(backend)}', deadline=5, hedging=False,
+                                   breaker=CircuitBreaker(failure_threshold=10 ** 9))
+        engine = TranslationEngine(backend, rate=1000, burst=1000, max_batch_chars=1, outbound=outbound)
+        monkeypatch.setattr(translation_service, '_engine', engine)
+        monkeypatch.setattr(translation_service, '_memory', TranslationMemory(db_path=None))
+        monkeypatch.setattr(app, 'result_cache', ResultCache(max_bytes=1024 * 1024))
+    return install
+
+
+def test_partial_translation_is_not_cached(use_backend):
+    backend = FlakyBackend('second')
+    use_backend(backend)
+
+    # The failed sentence keeps its English text for this request only
+    partial = app.translate_cached(SEGMENTS, 'hi')
+    assert partial[0]['text'] == '<hi>The first sentence. The second sentence.'
+
+    backend.failing = ()
+    recovered = app.translate_cached(SEGMENTS, 'hi')
+    assert [segment['text'] for segment in recovered] == [
+        '<hi>The first sentence. <hi>The second sentence.', '<hi>The third sentence.']
+
+
+def test_failed_translation_is_not_cached(use_backend):
+    backend = FlakyBackend('sentence')
+    use_backend(backend)
+
+    assert app.translate_cached(SEGMENTS, 'hi') is None
+    backend.failing = ()
+    assert app.translate_cached(SEGMENTS, 'hi')[1]['text'] == '<hi>The third sentence.'
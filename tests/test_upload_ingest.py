@@ -0,0 +1,22 @@
+import io
+
+import pytest
+
+from upload_ingest import ingest_multipart, UploadRejected
+
+BODY = (b'--B\r\nContent-Disposition: form-data; name="language"\r\n\r\nhi\r\n'
+        b'--B\r\nContent-Disposition: form-data; name="video"; filename="a.mp4"\r\n'
+        b'Content-Type: video/mp4\r\n\r\n' + b'\0' * 4096 + b'\r\n--B--\r\n')
+
+
+def test_complete_upload_is_saved(tmp_path):
+    upload = ingest_multipart(io.BytesIO(BODY), 'B', str(tmp_path), decode_audio=False, block_size=1024)
+    assert upload.size == 4096
+    assert upload.fields == {'language': 'hi'}
+
+
+@pytest.mark.parametrize('length', [60, len(BODY) // 2, len(BODY) - len(b'\r\n--B--\r\n')])
+def test_truncated_upload_is_rejected(tmp_path, length):
+    with pytest.raises(UploadRejected, match='interrupted'):
+        ingest_multipart(io.BytesIO(BODY[:length]), 'B', str(tmp_path), decode_audio=False, block_size=1024)
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,65 @@
+import re
+
+# A standalone lowercase "i" (including "i'm", "i've", "i'll", "i'd") after
+# a space. The literal prefix lets the regex engine skip ahead quickly.
+STANDALONE_I = re.compile(r" i(?!\w)")
+
+# A sentence starts at a non-space character and runs through end
+# punctuation that is followed by whitespace (or to the end of the text),
+# so decimals, abbreviations and domains stay inside their sentence
+SENTENCE_PATTERN = re.compile(r"[^.!?\s][^.!?]*(?:[.!?](?!\s|$)[^.!?]*)*[.!?]*")
+
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+SENTENCE_END = '.!?'
+
+
+def normalize(text):
+    """Collapse whitespace and capitalize a standalone "i"
+
+    Splitting and joining runs in C, so together with one substitution
+    this is cheaper than any single regex pass with a Python callback.
+    """
+    text = ' ' + ' '.join(str(text).split())
+    return STANDALONE_I.sub(' I', text)[1:]
+
+
+def sentence_spans(text):
+    """
+    Find the sentences of a text without copying them.
+
+    Expects normalized text, where only the last sentence can end without
+    punctuation and nothing trails it.
+
+    Returns:
+        list: (start, end) offsets of each sentence, without surrounding
+        whitespace and including its end punctuation.
+    """
+    return [match.span() for match in SENTENCE_PATTERN.finditer(text)]
+
+
+def split_sentences(text):
+    """Split text into stripped sentences, keeping their end punctuation"""
+    return [text[start:end] for start, end in sentence_spans(text)]
+
+
+def finish_sentence(sentence):
+    """Capitalize a sentence and make sure it ends with punctuation"""
+    if not sentence:
+        return sentence
+    if sentence[-1] not in SENTENCE_END:
+        sentence += '.'
+    if sentence[0].islower():
+        sentence = sentence[0].upper() + sentence[1:]
+    return sentence
+
+
+def clean_sentences(text):
+    """Normalize text once and return its finished sentences"""
+    text = normalize(text)
+    return [finish_sentence(text[start:end]) for start, end in sentence_spans(text)]
+
+
+def words(text):
+    """Lowercase word tokens of a text"""
+    return WORD_PATTERN.findall(text.lower())
@@ -0,0 +1,119 @@
+import json
+from text_pipeline import split_sentences, words
+
+# Subtitle export settings
+SUBTITLE_MAX_WORDS = 14        # Longer segments are split into several cues
+SUBTITLE_MIN_SECONDS = 1.0     # Shortest time a split cue stays on screen
+
+
+def make_segment(start, end, text):
+    """Build a ``{'start', 'end', 'text'}`` segment with times rounded to milliseconds"""
+    return {'start': round(start, 3), 'end': round(max(start, end), 3), 'text': text}
+
+
+def segments_text(segments):
+    """Join segment texts into one flat transcript"""
+    return ' '.join(segment['text'] for segment in segments if segment['text'])
+
+
+def subtitle_cues(segments, max_words=SUBTITLE_MAX_WORDS):
+    """
+    Split segments into cues short enough to read on screen.
+
+    A long segment is cut into runs of at most ``max_words`` words and its
+    time span is shared out in proportion to the words in each run.
+
+    Returns:
+        list: Segments suitable for SRT/VTT output, in order.
+    """
+    cues = []
+    for segment in segments:
+        cue_words = segment['text'].split()
+        if len(cue_words) <= max_words:
+            if cue_words:
+                cues.append(segment)
+            continue
+
+        parts = [cue_words[i:i + max_words] for i in range(0, len(cue_words), max_words)]
+        span = segment['end'] - segment['start']
+        seconds_per_word = max(span / len(cue_words), SUBTITLE_MIN_SECONDS / max_words)
+        start = segment['start']
+        for part in parts:
+            end = min(segment['end'], start + seconds_per_word * len(part))
+            cues.append(make_segment(start, end, ' '.join(part)))
+            start = end
+    return cues
+
+
+def format_timestamp(seconds, separator='.'):
+    """Format seconds as ``HH:MM:SS.mmm`` (SRT uses ',' before the milliseconds)"""
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def to_srt(segments):
+    """Render segments as SubRip (SRT) subtitles"""
+    blocks = []
+    for number, cue in enumerate(subtitle_cues(segments), 1):
+        blocks.append(f"{number}\n{format_timestamp(cue['start'], ',')} --> "
+                      f"{format_timestamp(cue['end'], ',')}\n{cue['text']}\n")
+    return '\n'.join(blocks)
+
+
+def to_vtt(segments):
+    """Render segments as WebVTT subtitles"""
+    blocks = ['WEBVTT\n']
+    for cue in subtitle_cues(segments):
+        blocks.append(f"{format_timestamp(cue['start'])} --> {format_timestamp(cue['end'])}\n{cue['text']}\n")
+    return '\n'.join(blocks)
+
+
+def to_json(segments):
+    return json.dumps({'segments': segments}, ensure_ascii=False, indent=2)
+
+
+# Export format -> (renderer, mimetype, file extension)
+EXPORT_FORMATS = {
+    'srt': (to_srt, 'application/x-subrip', 'srt'),
+    'vtt': (to_vtt, 'text/vtt', 'vtt'),
+    'json': (to_json, 'application/json', 'json'),
+}
+
+
+def locate_sentences(text, segments):
+    """
+    Map each sentence of a derived text (such as a summary) to source times.
+
+    Every sentence is matched to the segment sharing the largest share of
+    its words; a sentence spread over neighbouring segments takes their
+    combined span.
+
+    Returns:
+        list: One segment per sentence, in order.
+    """
+    segment_words = [set(words(segment['text'])) for segment in segments]
+    located = []
+    for sentence in split_sentences(text or ''):
+        sentence_words = set(words(sentence))
+        if not sentence_words:
+            continue
+        if not segments:
+            located.append(make_segment(0, 0, sentence))
+            continue
+
+        scores = [len(sentence_words & candidate) / float(len(sentence_words)) for candidate in segment_words]
+        best = max(range(len(segments)), key=scores.__getitem__)
+        first = last = best
+        # Extend over neighbours that cover words the best segment misses
+        missing = sentence_words - segment_words[best]
+        while missing and first > 0 and missing & segment_words[first - 1]:
+            first -= 1
+            missing -= segment_words[first]
+        while missing and last + 1 < len(segments) and missing & segment_words[last + 1]:
+            last += 1
+            missing -= segment_words[last]
+        located.append(make_segment(segments[first]['start'], segments[last]['end'], sentence))
+    return located
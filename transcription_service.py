@@ -1,36 +1,309 @@
 import speech_recognition as sr
 import os
-from audio_processor import convert_to_wav
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pydub import AudioSegment
+from audio_processor import MediaSource, detect_speech, PCM_SAMPLE_RATE, PCM_SAMPLE_WIDTH
+from transcript_segments import make_segment, segments_text
+from outbound import OutboundService
 
-def transcribe_audio(audio_path):
+# Chunked recognition settings
+CHUNK_SECONDS = 30           # Target length of each recognition request
+SPLIT_SEARCH_SECONDS = 5     # Window before a chunk end searched for a pause
+SPLIT_FRAME_MS = 100         # Frame size used to find the quietest split point
+SILENCE_RMS = 300            # Frames quieter than this count as a pause
+OVERLAP_SECONDS = 1          # Overlap added when a chunk must split mid-speech
+MAX_OVERLAP_WORDS = 10       # Longest repeated run removed at an overlap
+RECOGNITION_CONCURRENCY = int(os.environ.get('RECOGNITION_CONCURRENCY', 4))
+VAD_ENABLED = os.environ.get('VAD_ENABLED', 'true').lower() != 'false'
+RECOGNITION_DEADLINE = float(os.environ.get('RECOGNITION_DEADLINE', 60))  # Seconds per chunk, hedges included
+
+# Calls to the Google Web Speech API share one deadline, hedging and circuit
+# breaker; unintelligible audio is a normal answer, not a failure
+google_service = OutboundService('recognition', deadline=RECOGNITION_DEADLINE,
+                                 expected_exceptions=(sr.UnknownValueError,))
+
+
+class GoogleRecognizer:
+    """Google Web Speech API backend"""
+
+    def __init__(self, language='en-US'):
+        self.language = language
+
+    def recognize(self, audio_data):
+        recognizer = sr.Recognizer()
+        recognizer.operation_timeout = RECOGNITION_DEADLINE
+        return google_service.call(recognizer.recognize_google, audio_data, language=self.language)
+
+
+# Offline models are loaded once per worker process and shared by all requests
+_models = {}
+_models_lock = threading.Lock()
+_inference_locks = {}
+
+
+def load_model(key, loader):
+    """Return the cached model for ``key``, calling ``loader()`` on first use"""
+    with _models_lock:
+        if key not in _models:
+            print(f"📦 Loading speech model {key}...")
+            _models[key] = loader()
+        return _models[key]
+
+
+class VoskRecognizer:
+    """Offline Vosk (Kaldi) backend running on the CPU"""
+
+    def __init__(self, model_path=None):
+        self.model_path = model_path or os.environ.get('VOSK_MODEL_PATH', 'model')
+
+    def load(self):
+        try:
+            from vosk import Model, SetLogLevel
+        except ImportError:
+            raise Exception("The vosk backend requires the 'vosk' package (pip install vosk)")
+        if not os.path.isdir(self.model_path):
+            raise Exception(f"Vosk model not found at {self.model_path}. "
+                            "Download one from https://alphacephei.com/vosk/models")
+        SetLogLevel(-1)
+        return load_model(('vosk', self.model_path), lambda: Model(self.model_path))
+
+    def recognize(self, audio_data):
+        from vosk import KaldiRecognizer
+
+        # Recognizers are cheap and not thread-safe; the model is shared
+        recognizer = KaldiRecognizer(self.load(), PCM_SAMPLE_RATE)
+        recognizer.AcceptWaveform(audio_data.get_raw_data(convert_rate=PCM_SAMPLE_RATE,
+                                                          convert_width=PCM_SAMPLE_WIDTH))
+        text = json.loads(recognizer.FinalResult()).get('text', '')
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class WhisperRecognizer:
+    """Offline Whisper backend running on the CPU"""
+
+    def __init__(self, model_name=None):
+        self.model_name = model_name or os.environ.get('WHISPER_MODEL', 'base.en')
+        with _models_lock:
+            self._lock = _inference_locks.setdefault(('whisper', self.model_name), threading.Lock())
+
+    def load(self):
+        try:
+            import whisper
+        except ImportError:
+            raise Exception("The whisper backend requires the 'openai-whisper' package")
+        return load_model(('whisper', self.model_name), lambda: whisper.load_model(self.model_name, device='cpu'))
+
+    def recognize(self, audio_data):
+        import numpy as np
+
+        model = self.load()
+        pcm = audio_data.get_raw_data(convert_rate=PCM_SAMPLE_RATE, convert_width=PCM_SAMPLE_WIDTH)
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        # A single model instance is not safe to run from several threads
+        with self._lock:
+            result = model.transcribe(samples, language='en', fp16=False)
+        text = result.get('text', '').strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+# Recognizer backends selectable with RECOGNIZER_BACKEND. Any object with a
+# recognize(audio_data) -> str method (raising sr.UnknownValueError for
+# unintelligible audio) can be passed to transcribe_pcm instead.
+RECOGNIZER_BACKENDS = {
+    'google': GoogleRecognizer,
+    'vosk': VoskRecognizer,
+    'whisper': WhisperRecognizer,
+}
+
+
+def get_recognizer(name=None):
+    """Create the configured recognizer backend"""
+    name = name or os.environ.get('RECOGNIZER_BACKEND', 'google')
+    if name not in RECOGNIZER_BACKENDS:
+        raise Exception(f"Unknown recognizer backend: {name}")
+    return RECOGNIZER_BACKENDS[name]()
+
+
+def transcribe_audio(audio_path, recognizer=None, on_chunk=None):
     """Transcribe audio to English"""
+    return segments_text(transcribe_audio_segments(audio_path, recognizer=recognizer, on_chunk=on_chunk))
+
+
+def transcribe_audio_segments(audio_path, recognizer=None, on_chunk=None):
+    """Transcribe an audio file to timed English segments"""
     try:
-        recognizer = sr.Recognizer()
-        
-        # Convert to WAV if needed
-        if not audio_path.endswith('.wav'):
-            audio_path = convert_to_wav(audio_path)
-        
         print("🔊 Transcribing audio to English...")
-        
-        with sr.AudioFile(audio_path) as source:
-            # Adjust for ambient noise and record
-            print("🎙️ Adjusting for ambient noise...")
-            recognizer.adjust_for_ambient_noise(source, duration=1)
-            
-            print("🎤 Recording audio...")
-            audio_data = recognizer.record(source)
-            
-            # Perform speech recognition
-            print("🔄 Converting speech to text...")
-            text = recognizer.recognize_google(audio_data, language='en-US')
-            
-            print(f"✅ Transcription successful. Text length: {len(text)}")
-            return text
-            
+
+        # Decode any audio format straight to recognizer-ready PCM
+        pcm_data = MediaSource(audio_path).read_pcm()
+
+    except Exception as e:
+        raise Exception(f"Transcription failed: {str(e)}")
+
+    return transcribe_segments(pcm_data, recognizer=recognizer, on_chunk=on_chunk)
+
+
+def transcribe_pcm(pcm_data, sample_rate=PCM_SAMPLE_RATE, sample_width=PCM_SAMPLE_WIDTH,
+                   recognizer=None, max_workers=RECOGNITION_CONCURRENCY, on_chunk=None, vad=VAD_ENABLED):
+    """Transcribe raw mono PCM (as streamed by MediaSource) to English text"""
+    return segments_text(transcribe_segments(pcm_data, sample_rate, sample_width, recognizer=recognizer,
+                                             max_workers=max_workers, on_chunk=on_chunk, vad=vad))
+
+
+def transcribe_segments(pcm_data, sample_rate=PCM_SAMPLE_RATE, sample_width=PCM_SAMPLE_WIDTH,
+                        recognizer=None, max_workers=RECOGNITION_CONCURRENCY, on_chunk=None, vad=VAD_ENABLED):
+    """Transcribe raw mono PCM to timed English segments.
+
+    With ``vad`` only the speech regions found by voice-activity detection
+    are sent for recognition. The audio is split into chunks at pauses and
+    the chunks are recognized concurrently, then stitched back together in
+    order; each chunk becomes one ``{'start', 'end', 'text'}`` segment with
+    times in seconds. ``on_chunk`` is called as ``on_chunk(index, total,
+    text)`` with the newly stitched text as each chunk completes, in order.
+    """
+    try:
+        if not pcm_data:
+            raise Exception("No audio data to transcribe.")
+
+        recognizer = recognizer or get_recognizer()
+        chunks = plan_chunks(pcm_data, sample_rate, sample_width, vad=vad)
+
+        print(f"🔄 Converting speech to text in {len(chunks)} chunk(s)...")
+
+        def recognize_chunk(chunk):
+            start, end, _ = chunk
+            audio_data = sr.AudioData(pcm_data[start:end], sample_rate, sample_width)
+            try:
+                return recognizer.recognize(audio_data)
+            except sr.UnknownValueError:
+                return ""  # Silence or music in this chunk only
+
+        words = []
+        segments = []
+        bytes_per_second = float(sample_rate * sample_width)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+            for index, (chunk, chunk_text) in enumerate(zip(chunks, executor.map(recognize_chunk, chunks))):
+                added = append_transcript(words, chunk_text, chunk[2])
+                if added:
+                    # Overlapping chunks start where the previous segment ended
+                    start = chunk[0] / bytes_per_second
+                    if segments:
+                        start = max(start, segments[-1]['end'])
+                    segments.append(make_segment(start, chunk[1] / bytes_per_second, ' '.join(added)))
+                if on_chunk:
+                    on_chunk(index, len(chunks), ' '.join(added))
+
+        if not segments:
+            raise sr.UnknownValueError()
+
+        print(f"✅ Transcription successful. {len(segments)} segment(s), "
+              f"text length: {len(segments_text(segments))}")
+        return segments
+
     except sr.UnknownValueError:
         raise Exception("Speech recognition could not understand the audio. Please try with clearer audio.")
     except sr.RequestError as e:
         raise Exception(f"Speech recognition service error. Please check your internet connection: {e}")
     except Exception as e:
-        raise Exception(f"Transcription failed: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Transcription failed: {str(e)}")
+
+
+def split_pcm(pcm_data, sample_rate=PCM_SAMPLE_RATE, sample_width=PCM_SAMPLE_WIDTH,
+              chunk_seconds=CHUNK_SECONDS):
+    """
+    Split mono PCM into chunks that end at pauses where possible.
+
+    Each chunk boundary is placed at the quietest frame within the last
+    SPLIT_SEARCH_SECONDS of the target chunk length. If that frame is still
+    speech, the next chunk starts OVERLAP_SECONDS earlier so no word is cut.
+
+    Returns:
+        list: (start_byte, end_byte, overlaps_previous) tuples, in order.
+    """
+    segment = AudioSegment(data=pcm_data, sample_width=sample_width,
+                           frame_rate=sample_rate, channels=1)
+    total_ms = len(segment)
+    bytes_per_ms = sample_rate * sample_width / 1000.0
+
+    def to_byte(ms):
+        return min(len(pcm_data), int(ms * bytes_per_ms) // sample_width * sample_width)
+
+    chunks = []
+    start_ms = 0
+    overlapped = False
+    chunk_ms = chunk_seconds * 1000
+    while start_ms < total_ms:
+        if total_ms - start_ms <= chunk_ms:
+            chunks.append((to_byte(start_ms), len(pcm_data), overlapped))
+            break
+
+        # Find the quietest frame near the target end of this chunk
+        target_ms = start_ms + chunk_ms
+        search_from = max(start_ms + SPLIT_FRAME_MS, target_ms - SPLIT_SEARCH_SECONDS * 1000)
+        split_ms, split_rms = target_ms, None
+        for frame_ms in range(int(search_from), int(target_ms), SPLIT_FRAME_MS):
+            rms = segment[frame_ms:frame_ms + SPLIT_FRAME_MS].rms
+            if split_rms is None or rms < split_rms:
+                split_ms, split_rms = frame_ms + SPLIT_FRAME_MS // 2, rms
+
+        chunks.append((to_byte(start_ms), to_byte(split_ms), overlapped))
+        overlapped = split_rms is None or split_rms > SILENCE_RMS
+        start_ms = split_ms - OVERLAP_SECONDS * 1000 if overlapped else split_ms
+
+    return chunks
+
+
+def plan_chunks(pcm_data, sample_rate=PCM_SAMPLE_RATE, sample_width=PCM_SAMPLE_WIDTH, vad=VAD_ENABLED):
+    """
+    Choose the byte ranges of ``pcm_data`` to send for recognition.
+
+    With ``vad`` silence longer than VAD_MIN_SILENCE_MS is skipped and each
+    speech region is split with split_pcm; otherwise the whole buffer is.
+    Offsets are absolute, so they keep the position of each chunk in the
+    original audio.
+
+    Returns:
+        list: (start_byte, end_byte, overlaps_previous) tuples, in order.
+    """
+    if not vad:
+        return split_pcm(pcm_data, sample_rate, sample_width)
+
+    regions = detect_speech(pcm_data, sample_rate)
+    chunks = []
+    for region in regions:
+        region_chunks = split_pcm(pcm_data[region.start_byte:region.end_byte], sample_rate, sample_width)
+        chunks.extend((region.start_byte + start, region.start_byte + end, overlapped)
+                      for start, end, overlapped in region_chunks)
+
+    speech_seconds = sum(region.duration for region in regions)
+    total_seconds = len(pcm_data) / float(sample_rate * sample_width)
+    print(f"🗣️ Voice activity: {speech_seconds:.1f}s of speech in {total_seconds:.1f}s of audio "
+          f"({len(regions)} region(s))")
+    return chunks
+
+
+def _normalize_word(word):
+    return word.lower().strip('.,!?;:"\'')
+
+
+def append_transcript(words, text, overlapped):
+    """Append a chunk transcript to ``words``, dropping words repeated across an overlap
+
+    Returns:
+        list: The words that were added.
+    """
+    chunk_words = text.split()
+    if overlapped and words:
+        limit = min(MAX_OVERLAP_WORDS, len(words), len(chunk_words))
+        for n in range(limit, 0, -1):
+            if [_normalize_word(w) for w in words[-n:]] == [_normalize_word(w) for w in chunk_words[:n]]:
+                chunk_words = chunk_words[n:]
+                break
+    words.extend(chunk_words)
+    return chunk_words
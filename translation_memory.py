@@ -0,0 +1,114 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import logging
+from collections import OrderedDict
+
+DEFAULT_DB_PATH = os.path.join(tempfile.gettempdir(), 'translation_memory.sqlite3')
+
+
+class TranslationMemory:
+    """
+    Sentence-level translation memory shared across requests.
+
+    Translations are keyed by (normalized sentence, target language). A
+    bounded in-process LRU sits in front of a SQLite table, so hot
+    sentences never touch disk and everything survives restarts.
+    Pass ``db_path=None`` for a memory-only store.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, lru_size=10000):
+        self.lru_size = lru_size
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._db = None
+        if db_path:
+            try:
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute('PRAGMA journal_mode=WAL')
+                self._db.execute(
+                    'CREATE TABLE IF NOT EXISTS translations ('
+                    'sentence TEXT NOT NULL, lang TEXT NOT NULL, translation TEXT NOT NULL, '
+                    'PRIMARY KEY (sentence, lang))')
+                self._db.commit()
+            except sqlite3.Error as e:
+                logging.warning(f"Translation memory store unavailable, using memory only: {e}")
+                self._db = None
+
+    def _remember(self, key, translation):
+        self._lru[key] = translation
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def get_many(self, sentences, lang):
+        """
+        Look up translations for normalized sentences.
+
+        Returns:
+            dict: sentence -> translation for every sentence found.
+        """
+        found = {}
+        with self._lock:
+            missing = []
+            for sentence in set(sentences):
+                translation = self._lru.get((sentence, lang))
+                if translation is not None:
+                    self._lru.move_to_end((sentence, lang))
+                    found[sentence] = translation
+                else:
+                    missing.append(sentence)
+
+            if missing and self._db is not None:
+                try:
+                    for i in range(0, len(missing), 500):
+                        chunk = missing[i:i + 500]
+                        placeholders = ','.join('?' * len(chunk))
+                        rows = self._db.execute(
+                            f'SELECT sentence, translation FROM translations '
+                            f'WHERE lang = ? AND sentence IN ({placeholders})', [lang] + chunk)
+                        for sentence, translation in rows:
+                            found[sentence] = translation
+                            self._remember((sentence, lang), translation)
+                except sqlite3.Error as e:
+                    logging.warning(f"Translation memory lookup failed: {e}")
+
+            for sentence in sentences:
+                if sentence in found:
+                    self.hits += 1
+                    self.bytes_saved += len(sentence.encode('utf-8'))
+                else:
+                    self.misses += 1
+        return found
+
+    def put_many(self, translations, lang):
+        """Store a dict of sentence -> translation for a language"""
+        if not translations:
+            return
+        with self._lock:
+            for sentence, translation in translations.items():
+                self._remember((sentence, lang), translation)
+            if self._db is not None:
+                try:
+                    self._db.executemany(
+                        'INSERT OR REPLACE INTO translations (sentence, lang, translation) VALUES (?, ?, ?)',
+                        [(sentence, lang, translation) for sentence, translation in translations.items()])
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logging.warning(f"Translation memory write failed: {e}")
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+                'bytes_saved': self.bytes_saved,
+                'lru_entries': len(self._lru),
+                'persistent': self._db is not None,
+            }
@@ -1,8 +1,15 @@
-from googletrans import Translator
+import os
 import time
+import queue
 import logging
+import threading
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+from translation_memory import TranslationMemory, DEFAULT_DB_PATH
+from text_pipeline import normalize, finish_sentence, clean_sentences
+from metrics import BYTES_PROCESSED, TRANSLATION_RETRIES, TRANSLATION_FALLBACKS
+from outbound import OutboundService
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -22,8 +29,211 @@ LANGUAGE_CODES = {
     'ta': 'ta', 'hi': 'hi', 'bn': 'bn', 'te': 'te', 'mr': 'mr', 'en': 'en'
 }
 
-def translate_text(text, target_lang):
-    """Robust translation with multiple fallback methods"""
+# Translation engine settings
+TRANSLATION_BACKEND = os.environ.get('TRANSLATION_BACKEND', 'googletrans')
+TRANSLATION_BACKEND_URL = os.environ.get('TRANSLATION_BACKEND_URL', 'http://127.0.0.1:5001/translate')
+TRANSLATION_CONCURRENCY = int(os.environ.get('TRANSLATION_CONCURRENCY', 4))
+TRANSLATION_RATE = float(os.environ.get('TRANSLATION_RATE', 5))  # Requests per second
+TRANSLATION_BURST = int(os.environ.get('TRANSLATION_BURST', 5))
+TRANSLATION_DEADLINE = float(os.environ.get('TRANSLATION_DEADLINE', 10))  # Seconds per request, hedges included
+MAX_BATCH_CHARS = 1500
+TRANSLATION_MEMORY_PATH = os.environ.get('TRANSLATION_MEMORY_PATH', DEFAULT_DB_PATH)  # Empty for memory only
+TRANSLATION_MEMORY_LRU_SIZE = int(os.environ.get('TRANSLATION_MEMORY_LRU_SIZE', 10000))
+BATCH_SEPARATOR = '\n'
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to pace outbound requests"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class GoogletransBackend:
+    """googletrans backend sharing a small pool of Translator clients"""
+
+    # Room for a hedged duplicate of every concurrent request
+    def __init__(self, pool_size=TRANSLATION_CONCURRENCY * 2, timeout=TRANSLATION_DEADLINE):
+        from googletrans import Translator
+        self.pool = queue.Queue()
+        for _ in range(pool_size):
+            self.pool.put(Translator(timeout=timeout))
+
+    def translate(self, text, target_lang):
+        translator = self.pool.get()
+        try:
+            result = translator.translate(text, dest=target_lang)
+        finally:
+            self.pool.put(translator)
+        if result and hasattr(result, 'text') and result.text:
+            return str(result.text).strip()
+        return None
+
+
+class HTTPBackend:
+    """LibreTranslate-compatible HTTP backend over a pooled session"""
+
+    def __init__(self, url=TRANSLATION_BACKEND_URL, timeout=TRANSLATION_DEADLINE):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        # Room for a hedged duplicate of every concurrent request
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=TRANSLATION_CONCURRENCY * 2)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def translate(self, text, target_lang):
+        response = self.session.post(self.url, json={
+            'q': text, 'source': 'en', 'target': target_lang, 'format': 'text'
+        }, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json().get('translatedText')
+
+
+TRANSLATION_BACKENDS = {
+    'googletrans': GoogletransBackend,
+    'http': HTTPBackend,
+}
+
+
+class TranslationEngine:
+    """
+    Batched, concurrent translator.
+
+    Sentences are packed into batches of at most ``max_batch_chars``
+    characters joined by BATCH_SEPARATOR, and batches are sent concurrently
+    under a token-bucket rate limit. If a translated batch does not split
+    back into the same number of sentences, its sentences are retried one
+    by one; a sentence that still fails keeps its original text.
+
+    At most ``max_workers`` requests are in flight across all callers, so
+    several languages translated side by side share the backend's
+    connection pool instead of overflowing it.
+
+    Requests go through ``outbound`` (an OutboundService), which enforces
+    a deadline, hedges slow requests and stops calling the backend while
+    it keeps failing, so a degraded backend costs milliseconds per
+    sentence rather than seconds.
+    """
+
+    def __init__(self, backend, max_workers=TRANSLATION_CONCURRENCY,
+                 rate=TRANSLATION_RATE, burst=TRANSLATION_BURST, max_batch_chars=MAX_BATCH_CHARS, outbound=None):
+        self.backend = backend
+        self.outbound = outbound or OutboundService('translation', deadline=TRANSLATION_DEADLINE)
+        self.max_workers = max_workers
+        self.bucket = TokenBucket(rate, burst)
+        self.max_batch_chars = max_batch_chars
+        self.slots = threading.BoundedSemaphore(max_workers)
+
+    def make_batches(self, sentences):
+        batches = []
+        current, current_len = [], 0
+        for sentence in sentences:
+            extra = len(sentence) + (len(BATCH_SEPARATOR) if current else 0)
+            if current and current_len + extra > self.max_batch_chars:
+                batches.append(current)
+                current, current_len = [], 0
+                extra = len(sentence)
+            current.append(sentence)
+            current_len += extra
+        if current:
+            batches.append(current)
+        return batches
+
+    def _call(self, text, target_lang):
+        if self.outbound.breaker.is_open:
+            return None  # Fail fast instead of queueing at the rate limiter
+        self.bucket.acquire()
+        BYTES_PROCESSED.inc(len(text.encode('utf-8')), kind='translation_request')
+        try:
+            with self.slots:
+                return self.outbound.call(self.backend.translate, text, target_lang)
+        except Exception as e:
+            logging.warning(f"⚠️ Translation request failed: {e}")
+            return None
+
+    def _translate_batch(self, batch, target_lang):
+        """Returns a list of (translated_text or None) per sentence"""
+        if len(batch) > 1:
+            result = self._call(BATCH_SEPARATOR.join(batch), target_lang)
+            if result:
+                parts = [p.strip() for p in result.split(BATCH_SEPARATOR)]
+                if len(parts) == len(batch) and all(parts):
+                    return parts
+            if self.outbound.breaker.is_open:
+                return [None] * len(batch)  # The backend is down; retries would fail too
+            logging.info(f"🔄 Batch of {len(batch)} sentences did not round-trip, retrying individually")
+            TRANSLATION_RETRIES.inc(len(batch))
+        return [self._call(sentence, target_lang) for sentence in batch]
+
+    def translate_sentences(self, sentences, target_lang, on_batch=None):
+        """
+        Translate sentences, preserving order.
+
+        ``on_batch(batch, translated_batch)`` is called for each batch as it
+        completes, in order.
+
+        Returns:
+            list: Translated text, or None for sentences that failed.
+        """
+        batches = self.make_batches(sentences)
+        workers = max(1, min(self.max_workers, len(batches)))
+        translated = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(lambda batch: self._translate_batch(batch, target_lang), batches)
+            for batch, batch_result in zip(batches, results):
+                if on_batch:
+                    on_batch(batch, batch_result)
+                translated.extend(batch_result)
+        return translated
+
+
+_engine = None
+_engine_lock = threading.Lock()
+_memory = None
+
+
+def get_engine():
+    """Return the process-wide translation engine, creating it on first use"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = TranslationEngine(TRANSLATION_BACKENDS[TRANSLATION_BACKEND]())
+        return _engine
+
+
+def get_translation_memory():
+    """Return the process-wide translation memory, opening it on first use"""
+    global _memory
+    with _engine_lock:
+        if _memory is None:
+            _memory = TranslationMemory(TRANSLATION_MEMORY_PATH or None, TRANSLATION_MEMORY_LRU_SIZE)
+        return _memory
+
+
+def translate_text(text, target_lang, on_chunk=None):
+    """Robust translation with multiple fallback methods
+
+    ``on_chunk(done, total, text)`` receives translated text in order as
+    sentences complete.
+    """
     try:
         if not text or len(str(text).strip()) == 0:
             return text
@@ -31,133 +241,145 @@ def translate_text(text, target_lang):
         cleaned_text = clean_text(text)
         logging.info(f"🌐 Translating {len(cleaned_text)} characters to {LANGUAGES.get(target_lang, target_lang)}")
 
-        # Method 1: Try googletrans with error handling
-        result = safe_googletrans_translate(cleaned_text, target_lang)
+        result = split_and_translate(cleaned_text, target_lang, on_chunk=on_chunk)
         if result:
             return result
 
-        # Method 2: Fallback to simple split translation
-        logging.info("🔄 Trying split translation method...")
-        result = split_and_translate(cleaned_text, target_lang)
-        if result:
-            return result
-
-        # Method 3: Final fallback
         logging.warning("⚠️ All translation methods failed, returning original text")
+        TRANSLATION_FALLBACKS.inc(reason='unavailable')
         return f"[Translation unavailable] {cleaned_text}"
 
     except Exception as e:
         logging.error(f"💥 Translation error: {str(e)}")
+        TRANSLATION_FALLBACKS.inc(reason='error')
         return f"[Translation error] {text}"
 
-def safe_googletrans_translate(text, target_lang):
-    """Safe wrapper around googletrans with error handling"""
+def split_and_translate(text, target_lang, engine=None, memory=None, on_chunk=None):
+    """Split text into sentences and translate them in concurrent batches.
+
+    Sentences already in the translation memory are reused, and each
+    distinct missing sentence is sent to the backend only once.
+
+    Returns None when no sentence could be translated at all.
+    """
     try:
-        translator = Translator()
-        time.sleep(1)  # Rate limiting
-        
-        # For long texts, split into smaller chunks
-        if len(text) > 500:
-            return split_and_translate(text, target_lang)
-        
-        result = translator.translate(text, dest=target_lang)
-        
-        if result and hasattr(result, 'text') and result.text:
-            return str(result.text).strip()
-        return None
-        
-    except TypeError as e:
-        if "sequence item" in str(e) and "NoneType" in str(e):
-            logging.warning("🔧 Googletrans internal error detected, using fallback")
-            return split_and_translate(text, target_lang)
-        else:
-            logging.error(f"Googletrans TypeError: {e}")
+        sentences = clean_sentences(text)
+        if not sentences:
+            return text
+
+        translations = translate_sentence_list(sentences, target_lang, engine, memory, on_chunk)
+        if translations is None:
             return None
+        return ' '.join(translations)
+
     except Exception as e:
-        logging.error(f"Googletrans error: {e}")
+        logging.error(f"Split translation error: {e}")
         return None
 
-def split_and_translate(text, target_lang, max_chunk_size=400):
-    """Split text into chunks and translate separately"""
+def translate_segments(segments, target_lang, engine=None, memory=None, on_chunk=None, return_complete=False):
+    """Translate timed transcript segments, keeping their times.
+
+    The sentences of all segments go through the translation memory and
+    backend in one pass, so only sentences that changed since an earlier
+    run are sent again, and each result is regrouped under its segment.
+
+    Returns:
+        list: Translated ``{'start', 'end', 'text'}`` segments, or None
+        when no sentence could be translated at all. With
+        ``return_complete``, a ``(segments, complete)`` tuple where
+        ``complete`` is False if any sentence kept its original text.
+    """
+    translated, complete = _translate_segments(segments, target_lang, engine, memory, on_chunk)
+    return (translated, complete) if return_complete else translated
+
+def _translate_segments(segments, target_lang, engine, memory, on_chunk):
     try:
-        translator = Translator()
-        
-        # Split text into sentences
-        sentences = []
-        current_sentence = ""
-        
-        for char in text:
-            current_sentence += char
-            if char in '.!?':
-                sentences.append(current_sentence.strip())
-                current_sentence = ""
-        
-        # Add any remaining text
-        if current_sentence.strip():
-            sentences.append(current_sentence.strip())
-        
-        # Filter out empty sentences
-        sentences = [s for s in sentences if s and len(s.strip()) > 0]
-        
+        owners, sentences = [], []
+        for index, segment in enumerate(segments):
+            segment_sentences = clean_sentences(segment['text'])
+            owners.extend([index] * len(segment_sentences))
+            sentences.extend(segment_sentences)
         if not sentences:
-            return text
-        
-        logging.info(f"📝 Split into {len(sentences)} sentences for translation")
-        
-        # Translate each sentence individually
-        translated_sentences = []
-        for i, sentence in enumerate(sentences):
-            try:
-                time.sleep(0.5)  # Rate limiting between sentences
-                result = translator.translate(sentence, dest=target_lang)
-                if result and hasattr(result, 'text') and result.text:
-                    translated_sentences.append(str(result.text).strip())
-                    logging.info(f"✅ Translated sentence {i+1}/{len(sentences)}")
-                else:
-                    translated_sentences.append(sentence)  # Keep original if translation fails
-                    logging.warning(f"⚠️ Failed to translate sentence {i+1}, keeping original")
-            except Exception as e:
-                translated_sentences.append(sentence)  # Keep original on error
-                logging.warning(f"⚠️ Error translating sentence {i+1}: {e}")
-        
-        # Combine all translated sentences
-        final_translation = ' '.join(translated_sentences)
-        logging.info(f"🎉 Successfully translated {len(sentences)} sentences")
-        return final_translation
-        
+            return [dict(segment) for segment in segments], True
+
+        translations, complete = translate_sentence_list(sentences, target_lang, engine, memory, on_chunk,
+                                                         return_complete=True)
+        if translations is None:
+            TRANSLATION_FALLBACKS.inc(reason='unavailable')
+            return None, False
+
+        texts = [[] for _ in segments]
+        for index, translation in zip(owners, translations):
+            texts[index].append(translation)
+        return [dict(segment, text=' '.join(parts)) for segment, parts in zip(segments, texts)], complete
+
     except Exception as e:
-        logging.error(f"Split translation error: {e}")
-        return None
+        logging.error(f"💥 Segment translation error: {e}")
+        TRANSLATION_FALLBACKS.inc(reason='error')
+        return None, False
+
+def translate_sentence_list(sentences, target_lang, engine=None, memory=None, on_chunk=None,
+                            return_complete=False):
+    """Translate cleaned sentences through the translation memory and backend.
+
+    ``on_chunk(done, total, text)`` receives the longest newly resolved
+    in-order run of sentences as batches complete.
+
+    Returns:
+        list: One translation per sentence (the original where it failed),
+        or None when no sentence could be translated at all. With
+        ``return_complete``, a ``(translations, complete)`` tuple where
+        ``complete`` is True only if every sentence was translated.
+    """
+    memory = memory or get_translation_memory()
+    known = memory.get_many(sentences, target_lang)
+    misses = list(dict.fromkeys(s for s in sentences if s not in known))
+
+    logging.info(f"📝 Split into {len(sentences)} sentences for translation "
+                 f"({len(sentences) - len(misses)} from translation memory)")
+
+    # Report the longest in-order prefix of sentences that is resolved
+    resolved = set(known)
+    emitted = [0]
+
+    def emit_ready():
+        start = emitted[0]
+        while emitted[0] < len(sentences) and sentences[emitted[0]] in resolved:
+            emitted[0] += 1
+        if on_chunk and emitted[0] > start:
+            ready = sentences[start:emitted[0]]
+            on_chunk(emitted[0], len(sentences), ' '.join(known.get(s, s) for s in ready))
+
+    def on_batch(batch, translated_batch):
+        known.update((s, t) for s, t in zip(batch, translated_batch) if t)
+        resolved.update(batch)
+        emit_ready()
+
+    emit_ready()
+    if misses:
+        translated = (engine or get_engine()).translate_sentences(misses, target_lang, on_batch=on_batch)
+        fresh = {s: t for s, t in zip(misses, translated) if t}
+        memory.put_many(fresh, target_lang)
+        known.update(fresh)
+
+    succeeded = sum(1 for s in sentences if s in known)
+    complete = succeeded == len(sentences)
+    if succeeded == 0:
+        return (None, False) if return_complete else None
+    if not complete:
+        logging.warning(f"⚠️ Kept original text for {len(sentences) - succeeded} untranslated sentences")
+        TRANSLATION_FALLBACKS.inc(len(sentences) - succeeded, reason='sentence')
+
+    # Keep the original sentence wherever translation failed
+    logging.info(f"🎉 Successfully translated {succeeded}/{len(sentences)} sentences")
+    translations = [known.get(s, s) for s in sentences]
+    return (translations, complete) if return_complete else translations
 
 def clean_text(text):
     """Clean text for better translation"""
     try:
-        text = str(text).strip()
-        if not text:
-            return ""
-        
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        
-        # Fix common speech recognition issues
-        replacements = {
-            ' i ': ' I ',
-            " i'm ": " I'm ",
-            " i've ": " I've ",
-            " i'll ": " I'll ",
-            " i'd ": " I'd ",
-        }
-        
-        for wrong, correct in replacements.items():
-            text = text.replace(wrong, correct)
-        
-        # Ensure proper sentence structure
-        if text and not text[-1] in '.!?':
-            text += '.'
-        if text and text[0].islower():
-            text = text[0].upper() + text[1:]
-            
-        return text
+        # Collapse whitespace, fix "i" casing and finish the sentence
+        return finish_sentence(normalize(text))
         
     except Exception as e:
         logging.error(f"Text cleaning error: {e}")
@@ -166,6 +388,7 @@ def clean_text(text):
 def detect_language(text):
     """Detect the language of the given text"""
     try:
+        from googletrans import Translator
         translator = Translator()
         detected = translator.detect(text)
         return detected.lang, detected.confidence
@@ -0,0 +1,231 @@
+import os
+import re
+import uuid
+import hashlib
+import threading
+import subprocess
+from werkzeug.sansio.multipart import MultipartDecoder, Field, File, Data, Epilogue, NeedData
+from werkzeug.utils import secure_filename
+from moviepy.config import get_setting
+from audio_processor import PCM_SAMPLE_RATE, PCM_CHANNELS
+
+INGEST_BLOCK_SIZE = 1024 * 1024
+MAX_FIELD_SIZE = 64 * 1024
+INTERRUPTED = 'Upload was interrupted before it finished'
+DURATION_PATTERN = re.compile(rb'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)')
+
+
+class UploadRejected(Exception):
+    """Raised when an upload is refused before it has been fully received"""
+
+
+class IngestedUpload:
+    """A multipart upload that was written to disk while it was received.
+
+    ``pcm`` holds the 16 kHz mono PCM decoded during the transfer, or None
+    when the container could not be decoded from a pipe (for example an
+    MP4 whose ``moov`` atom sits at the end of the file).
+    """
+
+    def __init__(self):
+        self.fields = {}
+        self.filename = None
+        self.path = None
+        self.sha256 = None
+        self.size = 0
+        self.duration = None
+        self.pcm = None
+
+
+class StreamingDecoder:
+    """ffmpeg process turning container bytes on stdin into PCM on stdout"""
+
+    def __init__(self, on_duration=None):
+        self.on_duration = on_duration
+        self.duration = None
+        self.failed = False
+        self._pcm = bytearray()
+        self._stderr = b''
+        cmd = [
+            get_setting("FFMPEG_BINARY"), "-hide_banner", "-nostats", "-i", "pipe:0", "-vn",
+            "-ac", str(PCM_CHANNELS), "-ar", str(PCM_SAMPLE_RATE),
+            "-f", "s16le", "-acodec", "pcm_s16le", "pipe:1",
+        ]
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     stderr=subprocess.PIPE)
+        self._threads = [
+            threading.Thread(target=self._read_stdout, daemon=True),
+            threading.Thread(target=self._read_stderr, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _read_stdout(self):
+        for block in iter(lambda: self.proc.stdout.read(INGEST_BLOCK_SIZE), b''):
+            self._pcm.extend(block)
+
+    def _read_stderr(self):
+        for line in iter(self.proc.stderr.readline, b''):
+            if self.duration is None:
+                match = DURATION_PATTERN.search(line)
+                if match:
+                    hours, minutes, seconds = match.groups()
+                    self.duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+                    if self.on_duration:
+                        self.on_duration(self.duration)
+            if len(self._stderr) < 64 * 1024:
+                self._stderr += line
+
+    def feed(self, block):
+        if self.failed:
+            return
+        try:
+            self.proc.stdin.write(block)
+        except (BrokenPipeError, OSError):
+            # ffmpeg gave up on this input; the file on disk is still complete
+            self.failed = True
+
+    def finish(self):
+        """Close the input and return the decoded PCM, or None on failure"""
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        returncode = self.proc.wait()
+        for thread in self._threads:
+            thread.join()
+        if self.failed or returncode != 0 or not self._pcm:
+            return None
+        return bytes(self._pcm)
+
+    def abort(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.finish()
+
+
+def ingest_multipart(stream, boundary, upload_folder, file_fields=('video', 'audio'), allowed_extensions=None,
+                     max_duration=None, max_bytes=None, decode_audio=True, block_size=INGEST_BLOCK_SIZE,
+                     validate_field=None):
+    """
+    Receive a multipart body, streaming the file part to disk and to ffmpeg.
+
+    The file is hashed and written in large blocks as it arrives, and its
+    audio track is decoded concurrently so extraction overlaps with the
+    network transfer. As soon as ffmpeg reports the container duration,
+    uploads longer than ``max_duration`` are rejected without reading the
+    rest of the body. Likewise each form field is passed to
+    ``validate_field(name, value)`` as soon as it has been received; if
+    that returns an error message the upload is rejected on the spot, so
+    fields sent before the file save the client a doomed transfer.
+
+    Args:
+        stream: File-like request body.
+        boundary (str): Multipart boundary from the Content-Type header.
+        upload_folder (str): Directory the file part is written to.
+        file_fields (tuple): Form field names accepted for the file; the
+            first file part found is used.
+
+    Returns:
+        IngestedUpload: The saved upload with its form fields.
+
+    Raises:
+        UploadRejected: If the upload is missing, not allowed or too long.
+    """
+    upload = IngestedUpload()
+    decoder = MultipartDecoder(boundary.encode('latin-1'))
+    digest = hashlib.sha256()
+    too_long = []
+    ffmpeg = None
+    output = None
+    file_field = None
+    field_name, field_value = None, bytearray()
+
+    def check_duration(duration):
+        if max_duration and duration > max_duration:
+            too_long.append(duration)
+
+    def next_event():
+        try:
+            return decoder.next_event()
+        except ValueError:
+            # Werkzeug's decoder refuses a body that ends mid-part
+            raise UploadRejected(INTERRUPTED)
+
+    try:
+        finished = False
+        while not finished:
+            block = stream.read(block_size)
+            decoder.receive_data(block or None)
+            event = next_event()
+            while not finished and not isinstance(event, NeedData):
+                if isinstance(event, Field):
+                    field_name, field_value = event.name, bytearray()
+                elif isinstance(event, File):
+                    if event.name not in file_fields or upload.path is not None:
+                        field_name = None
+                    else:
+                        field_name = file_field = event.name
+                        filename = secure_filename(event.filename or '')
+                        if not filename:
+                            raise UploadRejected('No file selected')
+                        extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+                        if allowed_extensions and extension not in allowed_extensions:
+                            allowed = ', '.join(sorted(e.upper() for e in allowed_extensions))
+                            raise UploadRejected(f'Only {allowed} files are allowed')
+                        upload.filename = filename
+                        upload.path = os.path.join(upload_folder, f"{uuid.uuid4()}_{filename}")
+                        output = open(upload.path, 'wb')
+                        if decode_audio:
+                            ffmpeg = StreamingDecoder(on_duration=check_duration)
+                elif isinstance(event, Data):
+                    if field_name == file_field and output is not None and not output.closed:
+                        digest.update(event.data)
+                        output.write(event.data)
+                        upload.size += len(event.data)
+                        if max_bytes and upload.size > max_bytes:
+                            raise UploadRejected('File is too large')
+                        if ffmpeg is not None:
+                            ffmpeg.feed(event.data)
+                        if too_long:
+                            raise UploadRejected(f'Media must be {int(max_duration) // 60} minutes or shorter')
+                        if not event.more_data:
+                            output.close()
+                    elif field_name is not None:
+                        field_value.extend(event.data)
+                        if len(field_value) > MAX_FIELD_SIZE:
+                            raise UploadRejected(f'Form field {field_name} is too large')
+                        if not event.more_data:
+                            upload.fields[field_name] = field_value.decode('utf-8', 'replace')
+                            error = validate_field and validate_field(field_name, upload.fields[field_name])
+                            if error:
+                                raise UploadRejected(error)
+                elif isinstance(event, Epilogue):
+                    finished = True
+                    break
+                event = next_event()
+            if not block and not finished:
+                raise UploadRejected(INTERRUPTED)
+
+        if upload.path is None:
+            raise UploadRejected('No media file provided')
+        if output is not None and not output.closed:
+            output.close()
+
+        upload.sha256 = digest.hexdigest()
+        if ffmpeg is not None:
+            upload.pcm = ffmpeg.finish()
+            if too_long:
+                raise UploadRejected(f'Media must be {int(max_duration) // 60} minutes or shorter')
+            upload.duration = ffmpeg.duration
+            ffmpeg = None
+        return upload
+
+    except Exception:
+        if ffmpeg is not None:
+            ffmpeg.abort()
+        if output is not None and not output.closed:
+            output.close()
+        if upload.path and os.path.exists(upload.path):
+            os.remove(upload.path)
+        raise